@@ -0,0 +1,235 @@
+"""
+Content-addressed cache for generated datasets.
+
+A run's output (the six raw tables in output_dir) is stored under a key that
+hashes everything the data depends on: the config (seed included), the
+generation options, the generator source files and the versions of the
+libraries that draw or format values. A later run with the same key copies
+the stored tables back instead of generating them again. Entries are evicted
+least-recently-used once the cache grows past its size budget.
+
+Layout:
+    <cache_dir>/<key>/manifest.json      key inputs, size and last use
+    <cache_dir>/<key>/raw_*.csv|raw_*/   the cached raw tables
+
+Notes:
+- output_dir is not part of the key: the same data can be restored anywhere
+- Entries are written to a temporary directory and renamed into place, so an
+  interrupted run never leaves a half-written entry behind
+"""
+
+import hashlib
+from importlib.metadata import version
+import json
+import os
+from pathlib import Path
+import shutil
+import time
+
+from utils import RAW_SCHEMAS, SCRIPT_DIR, clear_table_output
+
+
+CACHE_DIR = SCRIPT_DIR / '.cache'
+
+# Default size budget of the whole cache
+DEFAULT_BUDGET_GB = 5.0
+
+# Generator files whose content changes the output
+SOURCE_FILES = [
+    'generate.py',
+    'random_data.py',
+    'bulk_data.py',
+    'edge_cases.py',
+    'edge_cases.yml',
+    'utils.py',
+]
+
+# Libraries whose version can change random draws, names or file encoding
+LIBRARIES = ['numpy', 'pandas', 'Faker', 'pyarrow']
+
+# Config keys that do not change the data itself
+UNKEYED_CONFIG = ['output_dir']
+
+MANIFEST = 'manifest.json'
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def cache_key(config, options):
+    """
+    Hex digest identifying a dataset.
+
+    Args:
+        config: Configuration dictionary (output_dir is ignored)
+        options: Dict of generation options that change the output
+
+    Returns:
+        str: sha256 over the config, options, library versions and the
+             bytes of every SOURCE_FILES entry
+    """
+    inputs = {
+        'config': {k: v for k, v in config.items() if k not in UNKEYED_CONFIG},
+        'options': options,
+        'libraries': {name: version(name) for name in LIBRARIES},
+    }
+    digest = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode())
+    for name in SOURCE_FILES:
+        digest.update(name.encode())
+        digest.update((SCRIPT_DIR / name).read_bytes())
+    return digest.hexdigest()
+
+
+def table_artifacts(directory):
+    """Raw table outputs in directory: <table>.csv files and <table>/ Parquet dirs."""
+    directory = Path(directory)
+    artifacts = []
+    for table in RAW_SCHEMAS:
+        for path in (directory / f"{table}.csv", directory / table):
+            if path.exists():
+                artifacts.append(path)
+    return artifacts
+
+
+def copy_artifact(path, target_dir):
+    """Copy a table file or directory into target_dir."""
+    target = Path(target_dir) / path.name
+    if path.is_dir():
+        shutil.copytree(path, target)
+    else:
+        shutil.copy2(path, target)
+
+
+def artifact_size(path):
+    """Size in bytes of a file, or of every file below a directory."""
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+    return path.stat().st_size
+
+
+def read_manifest(entry):
+    with open(entry / MANIFEST, 'r') as f:
+        return json.load(f)
+
+
+def write_manifest(entry, manifest):
+    with open(entry / MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+
+def list_entries(cache_dir=CACHE_DIR):
+    """Complete cache entries as [(entry_dir, manifest)], least recently used first."""
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_dir():
+        return []
+    entries = [
+        (entry, read_manifest(entry))
+        for entry in cache_dir.iterdir()
+        if (entry / MANIFEST).is_file()
+    ]
+    return sorted(entries, key=lambda item: item[1]['last_used'])
+
+
+# =============================================================================
+# CACHE OPERATIONS
+# =============================================================================
+
+def restore_output(key, output_dir, cache_dir=CACHE_DIR):
+    """
+    Copy a cached dataset into output_dir, replacing its raw tables.
+
+    Returns:
+        bool: True on a cache hit, False if the key is not cached
+    """
+    entry = Path(cache_dir) / key
+    if not (entry / MANIFEST).is_file():
+        return False
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    for table in RAW_SCHEMAS:
+        clear_table_output(table, output_path)
+    for path in table_artifacts(entry):
+        copy_artifact(path, output_path)
+
+    manifest = read_manifest(entry)
+    manifest['last_used'] = time.time()
+    manifest['hits'] = manifest.get('hits', 0) + 1
+    write_manifest(entry, manifest)
+    return True
+
+
+def store_output(key, output_dir, options, cache_dir=CACHE_DIR,
+                 budget_bytes=DEFAULT_BUDGET_GB * 1024 ** 3):
+    """
+    Store the raw tables of output_dir under key, then evict down to budget.
+
+    A dataset larger than the whole budget is not stored (the cache is still
+    evicted down to budget).
+
+    Returns:
+        tuple: (stored size in bytes or None, list of evicted keys)
+    """
+    artifacts = table_artifacts(output_dir)
+    size = sum(artifact_size(path) for path in artifacts)
+    if size > budget_bytes:
+        return None, evict(cache_dir, budget_bytes)
+
+    cache_path = Path(cache_dir)
+    entry = cache_path / key
+    if not entry.exists():
+        staging = cache_path / f".{key}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for path in artifacts:
+            copy_artifact(path, staging)
+        now = time.time()
+        write_manifest(staging, {
+            'key': key,
+            'options': options,
+            'tables': [path.name for path in artifacts],
+            'size_bytes': size,
+            'created_at': now,
+            'last_used': now,
+            'hits': 0,
+        })
+        try:
+            staging.rename(entry)
+        except OSError:
+            # Another run stored the same key first
+            shutil.rmtree(staging)
+
+    return size, evict(cache_dir, budget_bytes, keep=key)
+
+
+def evict(cache_dir=CACHE_DIR, budget_bytes=DEFAULT_BUDGET_GB * 1024 ** 3, keep=None):
+    """
+    Delete least-recently-used entries until the cache fits budget_bytes.
+
+    Args:
+        keep: Key that is never evicted (the entry just stored)
+
+    Returns:
+        List of evicted keys
+    """
+    entries = list_entries(cache_dir)
+    total = sum(manifest['size_bytes'] for _, manifest in entries)
+    evicted = []
+    for entry, manifest in entries:
+        if total <= budget_bytes:
+            break
+        if entry.name == keep:
+            continue
+        shutil.rmtree(entry)
+        total -= manifest['size_bytes']
+        evicted.append(entry.name)
+    return evicted
+
+
+if __name__ == '__main__':
+    # Quick look at the cache contents
+    for entry, manifest in reversed(list_entries()):
+        last_used = time.strftime('%Y-%m-%d %H:%M', time.localtime(manifest['last_used']))
+        print(f"{entry.name[:12]}  {manifest['size_bytes'] / 1024 ** 2:9.1f} MB  "
+              f"hits={manifest['hits']:<4} last used {last_used}  {manifest['options']}")
@@ -9,22 +9,57 @@ Generates two types of data:
 Notes:
 - All datetimes are timezone-aware (UTC)
 - Invoices include paid_at field
-- period_end computed via helpers (not hardcoded)
+- period_end computed via helpers for random data (declared in edge_cases.yml for edge cases)
 
 Usage:
     python3 generate.py
     python3 generate.py --edge-cases-only
+    python3 generate.py --edge-case-copies 1000
     python3 generate.py --random-only
+    python3 generate.py --engine bulk
+    python3 generate.py --engine bulk --workers 8
+    python3 generate.py --engine bulk --chunk-size 100000
+    python3 generate.py --engine bulk --customer-distribution zipf
+    python3 generate.py --format parquet --partition-by-month
+    python3 generate.py --target duckdb
+    python3 generate.py --cache
 """
 
 import argparse
+import importlib.util
+from pathlib import Path
 import pandas as pd
 import numpy as np
 from faker import Faker
 
-from utils import CONFIG, save_to_csv
-from edge_cases import generate_all_edge_cases
+from utils import (
+    CONFIG,
+    CUSTOMER_DISTRIBUTIONS,
+    SCRIPT_DIR,
+    clear_table_output,
+    save_tables,
+    to_arrow_table,
+)
+from cache import CACHE_DIR, DEFAULT_BUDGET_GB, cache_key, restore_output, store_output
+from edge_cases import generate_all_edge_cases, scenario_titles
 from random_data import generate_all_random_data
+from bulk_data import (
+    RANDOM_TABLES,
+    generate_all_bulk_data,
+    generate_bulk_customers,
+    stream_sharded_subscriptions,
+)
+
+# scripts/load_duckdb_raw.py owns the raw schema (table names and column types)
+LOADER_PATH = SCRIPT_DIR.parent / 'scripts' / 'load_duckdb_raw.py'
+
+
+def import_loader():
+    """Import scripts/load_duckdb_raw.py from its file path (sys.path is left alone)."""
+    spec = importlib.util.spec_from_file_location('load_duckdb_raw', LOADER_PATH)
+    loader = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(loader)
+    return loader
 
 
 def generate_plans_df(config):
@@ -44,35 +79,195 @@ def generate_plans_df(config):
     return pd.DataFrame(plans)
 
 
+def combine_records(edge_records, random_records):
+    """
+    Combine one table's edge case records with its random records.
+
+    Random records may be a list of dicts (loop engine) or a DataFrame
+    (bulk engine). In the latter case the edge case rows are cast to the
+    DataFrame's datetime dtypes so every column keeps a single type.
+    """
+    edge_df = pd.DataFrame(edge_records)
+    random_df = pd.DataFrame(random_records)
+
+    if len(edge_df) and isinstance(random_records, pd.DataFrame):
+        datetime_columns = random_df.select_dtypes(include=['datetime', 'datetimetz'])
+        edge_df = edge_df.astype(datetime_columns.dtypes.to_dict())
+
+    frames = [df for df in (edge_df, random_df) if len(df)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
 def combine_data(edge_data, random_data):
     """
     Combine edge case data with random data.
     
     Args:
         edge_data: Tuple of (customers, subs, events, invoices, lines)
-        random_data: Tuple of (customers, subs, events, invoices, lines)
+        random_data: Tuple of (customers, subs, events, invoices, lines),
+                     as lists of dicts or DataFrames
     
     Returns:
         Combined tuple of DataFrames
     """
-    ec_customers, ec_subs, ec_events, ec_invoices, ec_lines = edge_data
-    rd_customers, rd_subs, rd_events, rd_invoices, rd_lines = random_data
+    return tuple(
+        combine_records(edge_records, random_records)
+        for edge_records, random_records in zip(edge_data, random_data)
+    )
+
+
+def generate_in_memory(config, plans_df, edge_data, args):
+    """Steps 3-5: generate random data in memory, combine, and save the raw tables."""
+    # Generate random data
+    if not args.edge_cases_only:
+        print(f"\n3. Generating random bulk data ({args.engine} engine)...")
+        if args.engine == 'bulk':
+            random_data = generate_all_bulk_data(
+                config, workers=args.workers, shard_count=args.shards,
+                unique_names=args.unique_customer_names
+            )
+        else:
+            random_data = generate_all_random_data(config)
+        rd_customers, rd_subs, rd_events, rd_invoices, rd_lines = random_data
+        print(f"   Created {len(rd_customers)} random customers")
+        print(f"   Created {len(rd_subs)} random subscriptions")
+        print(f"   Created {len(rd_events)} random events")
+        print(f"   Created {len(rd_invoices)} random invoices")
+        print(f"   Created {len(rd_lines)} random invoice lines")
+    else:
+        random_data = ([], [], [], [], [])
     
-    # Combine lists
-    all_customers = ec_customers + rd_customers
-    all_subs = ec_subs + rd_subs
-    all_events = ec_events + rd_events
-    all_invoices = ec_invoices + rd_invoices
-    all_lines = ec_lines + rd_lines
+    # Combine data
+    print("\n4. Combining data...")
+    customers_df, subs_df, events_df, invoices_df, lines_df = combine_data(
+        edge_data, random_data
+    )
+    
+    # Summary
+    print(f"\n   Total customers: {len(customers_df)}")
+    print(f"   Total subscriptions: {len(subs_df)}")
+    print(f"   Total events: {len(events_df)}")
+    print(f"   Total invoices: {len(invoices_df)}")
+    print(f"   Total invoice lines: {len(lines_df)}")
+    
+    dataframes = {
+        'raw_customers': customers_df,
+        'raw_plans': plans_df,
+        'raw_subscriptions': subs_df,
+        'raw_subscription_events': events_df,
+        'raw_invoices': invoices_df,
+        'raw_invoice_lines': lines_df
+    }
+    if args.target == 'duckdb':
+        print(f"\n5. Loading into DuckDB ({args.warehouse}, schema raw)...")
+        load_into_duckdb(dataframes, args.warehouse)
+        return
+
+    # Save raw tables
+    print(f"\n5. Saving {args.format} files...")
+    save_tables(dataframes, config['output_dir'], args.format, args.partition_by_month)
+
+
+def load_into_duckdb(dataframes, warehouse):
+    """
+    Hand the raw tables to DuckDB as Arrow tables, skipping CSV/Parquet files.
+    
+    Every DataFrame is converted with its explicit RAW_SCHEMAS schema and
+    loaded by scripts/load_duckdb_raw.py into the raw schema (same table
+    names and column types as a file load, one transaction).
+    """
+    loader = import_loader()
+    
+    loader.load_arrow_tables(
+        {table: to_arrow_table(dataframes[table], table) for table in loader.TABLES},
+        warehouse=Path(warehouse)
+    )
+
+
+def generate_streaming(config, plans_df, edge_data, args):
+    """
+    Steps 3-5 for the bulk engine with --chunk-size: stream random data to disk.
+    
+    Edge cases, customers and plans are written first; random subscriptions
+    are then generated in fixed-size chunks and each chunk is appended to the
+    output files right away, so memory stays flat regardless of volume.
+    """
+    output_dir = Path(config['output_dir'])
+    ec_customers, *ec_tables = edge_data
+    
+    print("\n3. Generating random customers...")
+    customers = generate_bulk_customers(
+        config, start_id=100, unique_names=args.unique_customer_names
+    )
+    customer_ids = customers['customer_id'].to_numpy()
+    print(f"   Created {len(customers)} random customers")
+    
+    # Fresh files: edge case rows (if any) become the head of each table
+    print("\n4. Saving edge cases, customers and plans...")
+    dataframes = {
+        'raw_customers': combine_records(ec_customers, customers),
+        'raw_plans': plans_df,
+    }
+    for table, records in zip(RANDOM_TABLES, ec_tables):
+        clear_table_output(table, output_dir)
+        if len(records):
+            dataframes[table] = pd.DataFrame(records)
+    save_tables(dataframes, output_dir, args.format, args.partition_by_month)
+    
+    print(f"\n5. Streaming random subscriptions (chunks of {args.chunk_size})...")
+    counts = stream_sharded_subscriptions(
+        customer_ids, config, output_dir, args.chunk_size,
+        workers=args.workers, shard_count=args.shards, start_id=100,
+        output_format=args.format, partition_by_month=args.partition_by_month
+    )
+    for table, records, count in zip(RANDOM_TABLES, ec_tables, counts):
+        print(f"   Appended {count} rows to {table} ({len(records) + count} total)")
+
+
+def generation_options(args):
+    """Command-line options that change the generated data (part of the cache key)."""
+    return {
+        'edge_cases_only': args.edge_cases_only,
+        'random_only': args.random_only,
+        'edge_case_copies': args.edge_case_copies,
+        'engine': args.engine,
+        'shards': (args.shards or args.workers) if args.engine == 'bulk' else None,
+        'chunk_size': args.chunk_size,
+        'unique_customer_names': args.unique_customer_names,
+        'format': args.format,
+        'partition_by_month': args.partition_by_month,
+    }
+
+
+def generate_dataset(config, args):
+    """Steps 1-5: generate plans, edge cases and random data and write the raw tables."""
+    # Generate plans
+    print("\n1. Generating plans...")
+    plans_df = generate_plans_df(config)
+    print(f"   Created {len(plans_df)} plans")
     
-    # Convert to DataFrames
-    customers_df = pd.DataFrame(all_customers)
-    subs_df = pd.DataFrame(all_subs)
-    events_df = pd.DataFrame(all_events)
-    invoices_df = pd.DataFrame(all_invoices)
-    lines_df = pd.DataFrame(all_lines)
+    # Generate edge cases
+    if not args.random_only:
+        print("\n2. Generating deterministic edge cases (S001-S018)...")
+        edge_data = generate_all_edge_cases(copies=args.edge_case_copies)
+        ec_customers, ec_subs, ec_events, ec_invoices, ec_lines = edge_data
+        print(f"   Created {len(ec_customers)} test customers")
+        print(f"   Created {len(ec_subs)} test subscriptions")
+        print(f"   Created {len(ec_events)} test events")
+        print(f"   Created {len(ec_invoices)} test invoices")
+        print(f"   Created {len(ec_lines)} test invoice lines")
+        if args.edge_case_copies:
+            print(f"   (golden scenarios + {args.edge_case_copies} shifted copies)")
+    else:
+        edge_data = ([], [], [], [], [])
     
-    return customers_df, subs_df, events_df, invoices_df, lines_df
+    # Generate random data and write the raw tables
+    if args.chunk_size and not args.edge_cases_only:
+        generate_streaming(config, plans_df, edge_data, args)
+    else:
+        generate_in_memory(config, plans_df, edge_data, args)
 
 
 def main():
@@ -83,10 +278,67 @@ def main():
                         help='Generate only deterministic edge cases')
     parser.add_argument('--random-only', action='store_true',
                         help='Generate only random data')
+    parser.add_argument('--edge-case-copies', type=int, default=0,
+                        help='Also write N date-shifted copies of every edge case '
+                             'scenario (IDs suffixed _R000001, ...) for volume tests')
+    parser.add_argument('--engine', choices=['loop', 'bulk'], default='loop',
+                        help='Random data engine: row-by-row loop (default) or '
+                             'vectorized bulk engine for large volumes')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for the bulk engine (default: 1)')
+    parser.add_argument('--shards', type=int, default=None,
+                        help='Shards for the bulk engine (default: one per worker); '
+                             'output is reproducible for a given seed and shard count')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='Stream the bulk engine to disk in chunks of this many '
+                             'subscriptions instead of holding every row in memory')
+    parser.add_argument('--unique-customer-names', action='store_true',
+                        help='Redraw duplicate company names so every random '
+                             'customer name is distinct (bulk engine)')
+    parser.add_argument('--customer-distribution', choices=CUSTOMER_DISTRIBUTIONS,
+                        default=None,
+                        help='How random subscriptions fan out over customers '
+                             '(default: randomization.customer_distribution)')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Output format: one CSV file per table (default) or one '
+                             'directory of typed Parquet files per table')
+    parser.add_argument('--partition-by-month', action='store_true',
+                        help='Hive-partition raw_subscription_events and '
+                             'raw_invoice_lines by month (Parquet only)')
+    parser.add_argument('--target', choices=['files', 'duckdb'], default='files',
+                        help='Write raw table files (default) or load the tables straight '
+                             'into the raw schema of the DuckDB warehouse via Arrow')
+    parser.add_argument('--cache', action='store_true',
+                        help='Reuse the raw tables of an identical earlier run (same config, '
+                             'options and generator code) and cache new output')
+    parser.add_argument('--cache-dir', type=Path, default=CACHE_DIR,
+                        help='Cache directory (default: data_generation/.cache)')
+    parser.add_argument('--cache-budget-gb', type=float, default=DEFAULT_BUDGET_GB,
+                        help='Evict least-recently-used cache entries beyond this size '
+                             f'(default: {DEFAULT_BUDGET_GB:g})')
+    parser.add_argument('--warehouse', type=Path,
+                        default=SCRIPT_DIR.parent / 'warehouse' / 'warehouse.duckdb',
+                        help='DuckDB database file for --target duckdb')
     args = parser.parse_args()
+    if args.engine == 'loop' and (args.workers > 1 or args.shards or args.chunk_size
+                                  or args.unique_customer_names):
+        parser.error('--workers/--shards/--chunk-size/--unique-customer-names '
+                     'require --engine bulk')
+    if args.partition_by_month and args.format != 'parquet':
+        parser.error('--partition-by-month requires --format parquet')
+    if args.target == 'duckdb' and (args.chunk_size or args.format != 'csv'
+                                    or args.partition_by_month):
+        parser.error('--target duckdb loads in memory and cannot be combined with '
+                     '--chunk-size/--format/--partition-by-month')
+    if args.cache and args.target == 'duckdb':
+        parser.error('--cache caches output files and cannot be combined with --target duckdb')
+    if args.edge_case_copies and args.random_only:
+        parser.error('--edge-case-copies cannot be combined with --random-only')
     
     # Use config loaded from utils
     config = CONFIG
+    if args.customer_distribution:
+        config['randomization']['customer_distribution'] = args.customer_distribution
     
     # Set random seed for reproducibility - ensures the same "random" data is generated
     # each time the script runs with the same seed value, making results predictable and debuggable
@@ -98,63 +350,38 @@ def main():
     print("=" * 60)
     print(f"\nSeed: {config['seed']}")
     print(f"Date range: {config['date_range']['start_date']} to {config['date_range']['end_date']}")
-    print(f"Output: {config['output_dir']}/")
-    
-    # Generate plans
-    print("\n1. Generating plans...")
-    plans_df = generate_plans_df(config)
-    print(f"   Created {len(plans_df)} plans")
-    
-    # Generate edge cases
-    if not args.random_only:
-        print("\n2. Generating deterministic edge cases (S001-S018)...")
-        edge_data = generate_all_edge_cases()
-        ec_customers, ec_subs, ec_events, ec_invoices, ec_lines = edge_data
-        print(f"   Created {len(ec_customers)} test customers")
-        print(f"   Created {len(ec_subs)} test subscriptions")
-        print(f"   Created {len(ec_events)} test events")
-        print(f"   Created {len(ec_invoices)} test invoices")
-        print(f"   Created {len(ec_lines)} test invoice lines")
+    if args.target == 'duckdb':
+        print(f"Output: {args.warehouse} (schema raw)")
     else:
-        edge_data = ([], [], [], [], [])
-    
-    # Generate random data
-    if not args.edge_cases_only:
-        print("\n3. Generating random bulk data...")
-        random_data = generate_all_random_data(config)
-        rd_customers, rd_subs, rd_events, rd_invoices, rd_lines = random_data
-        print(f"   Created {len(rd_customers)} random customers")
-        print(f"   Created {len(rd_subs)} random subscriptions")
-        print(f"   Created {len(rd_events)} random events")
-        print(f"   Created {len(rd_invoices)} random invoices")
-        print(f"   Created {len(rd_lines)} random invoice lines")
-    else:
-        random_data = ([], [], [], [], [])
-    
-    # Combine data
-    print("\n4. Combining data...")
-    customers_df, subs_df, events_df, invoices_df, lines_df = combine_data(
-        edge_data, random_data
-    )
+        print(f"Output: {config['output_dir']}/")
+    print(f"Customer distribution: {config['randomization'].get('customer_distribution', 'uniform')}")
+    if args.engine == 'loop' and (config['invoices'].get('renewals')
+                                  or config['randomization'].get('prob_downgrade')):
+        print("Note: invoices.renewals and randomization.prob_downgrade apply to the bulk "
+              "engine only; the loop engine bills the initial term and generates no downgrades")
     
-    # Summary
-    print(f"\n   Total customers: {len(customers_df)}")
-    print(f"   Total subscriptions: {len(subs_df)}")
-    print(f"   Total events: {len(events_df)}")
-    print(f"   Total invoices: {len(invoices_df)}")
-    print(f"   Total invoice lines: {len(lines_df)}")
+    key = None
+    if args.cache:
+        key = cache_key(config, generation_options(args))
+        print(f"Cache key: {key[:12]}")
     
-    # Save to CSV
-    print("\n5. Saving CSV files...")
-    dataframes = {
-        'raw_customers.csv': customers_df,
-        'raw_plans.csv': plans_df,
-        'raw_subscriptions.csv': subs_df,
-        'raw_subscription_events.csv': events_df,
-        'raw_invoices.csv': invoices_df,
-        'raw_invoice_lines.csv': lines_df
-    }
-    save_to_csv(dataframes, config['output_dir'])
+    if key and restore_output(key, config['output_dir'], args.cache_dir):
+        print(f"\nCache hit: restored the raw tables from {args.cache_dir}/{key[:12]}... "
+              f"(generation skipped)")
+    else:
+        generate_dataset(config, args)
+        if key:
+            budget_bytes = args.cache_budget_gb * 1024 ** 3
+            size, evicted = store_output(
+                key, config['output_dir'], generation_options(args), args.cache_dir, budget_bytes
+            )
+            if size is None:
+                print(f"\n6. Not cached: output is larger than the "
+                      f"{args.cache_budget_gb:g} GB cache budget "
+                      f"({len(evicted)} least-recently-used entries evicted)")
+            else:
+                print(f"\n6. Cached output as {key[:12]} ({size / 1024 ** 2:.1f} MB, "
+                      f"{len(evicted)} least-recently-used entries evicted)")
     
     # Done
     print("\n" + "=" * 60)
@@ -164,28 +391,18 @@ def main():
     # Print edge case summary
     if not args.random_only:
         print("\nDeterministic test cases included:")
-        print("   S001: Monthly happy path")
-        print("   S002: Annual happy path")
-        print("   S003: First-month churn")
-        print("   S004: Long-tenure churn")
-        print("   S005: Monthly upgrade (prorated) - credit=-20, charge=+40")
-        print("   S006: Monthly upgrade near end - credit=-3, charge=+6")
-        print("   S007: Annual upgrade (prorated) - credit=-225, charge=+450")
-        print("   S008: Two upgrades in one term")
-        print("   S009: Monthly downgrade (next renewal)")
-        print("   S010: Annual downgrade (next renewal)")
-        print("   S011: Pause/resume")
-        print("   S012: Pause then cancel")
-        print("   S013: Cancel → reactivate")
-        print("   S014: Payment failed → recovered")
-        print("   S015: Missing invoice")
-        print("   S016: Adjustment line (-5)")
-        print("   S017: Starts at boundary (Jan 31)")
-        print("   S018: Annual mid-start + upgrade")
+        for scenario_id, title in scenario_titles().items():
+            print(f"   {scenario_id}: {title}")
+    
+    if args.target == 'duckdb':
+        print(f"\nWarehouse: {args.warehouse} (schema raw)")
+        print("\nNext steps:")
+        print("   1. Run dbt models and tests: cd warehouse && dbt build")
+        return
     
     print(f"\nOutput directory: {config['output_dir']}/")
     print("\nNext steps:")
-    print("   1. Load CSVs into your warehouse (BigQuery/Snowflake/DuckDB)")
+    print("   1. Load the raw tables into your warehouse (BigQuery/Snowflake/DuckDB)")
     print("   2. Run dbt models: dbt run")
     print("   3. Run dbt tests: dbt test")
 
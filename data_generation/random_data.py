@@ -8,6 +8,8 @@ Notes:
 - All datetimes are timezone-aware (UTC)
 - period_end computed via calculate_period_end() helper
 - paid_at included for paid invoices
+- Customers are assigned through a sampler precomputed once per run
+  (randomization.customer_distribution), one O(1) draw per subscription
 """
 
 from datetime import datetime
@@ -21,6 +23,8 @@ from utils import (
     calculate_proration,
     calculate_period_end,
     to_utc,
+    build_customer_sampler,
+    draw_customers,
     PLANS,
 )
 
@@ -119,10 +123,11 @@ def generate_random_subscriptions(customers, config, start_id=1):
     # Get plan list
     plan_list = list(PLANS.values())
     customer_ids = [c['customer_id'] for c in customers]
+    customer_sampler = build_customer_sampler(len(customer_ids), config)
     
     for i in range(start_id, start_id + config['sizes']['random_subscriptions']):
         subscription_id = generate_id('SUB', i)
-        customer_id = np.random.choice(customer_ids)
+        customer_id = customer_ids[draw_customers(customer_sampler)]
         
         # Random start date
         start_offset = np.random.randint(0, max(1, days_range - 60))
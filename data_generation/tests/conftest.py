@@ -0,0 +1,6 @@
+"""Make the data_generation modules importable the way the scripts import them."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
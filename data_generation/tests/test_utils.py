@@ -0,0 +1,120 @@
+"""
+The array helpers in utils.py must match their scalar versions element by
+element: the bulk engine uses the array helpers, the loop engine the scalar
+ones, and both must produce the same dates and amounts.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from utils import (
+    CONFIG,
+    CUSTOMER_DISTRIBUTIONS,
+    add_days,
+    add_days_array,
+    build_alias_table,
+    calculate_paid_at,
+    calculate_paid_at_array,
+    calculate_period_end,
+    calculate_period_end_array,
+    calculate_proration,
+    calculate_proration_array,
+    customer_weights,
+    draw_pay_delays,
+    format_ids,
+    generate_id,
+    get_term_days,
+    get_term_days_array,
+    to_utc,
+    to_utc_days,
+    to_utc_timestamps,
+)
+
+# Two year ends and the 2024 leap day
+DAYS = np.arange(np.datetime64('2023-12-01'), np.datetime64('2026-03-01'))
+OFFSETS = np.resize(np.arange(-400, 400), len(DAYS))
+
+PRICES = np.array([0, 9.99, 30, 45, 60, 99, 300, 333.33, 600, 1000])
+
+
+@pytest.mark.parametrize('start, days, expected', [
+    (date(2024, 1, 31), 1, date(2024, 2, 1)),
+    (date(2024, 1, 31), 30, date(2024, 3, 1)),
+    (date(2023, 1, 31), 30, date(2023, 3, 2)),
+    (date(2024, 2, 28), 1, date(2024, 2, 29)),
+    (date(2023, 2, 28), 1, date(2023, 3, 1)),
+    (date(2024, 2, 29), 360, date(2025, 2, 23)),
+    (date(2023, 3, 1), 360, date(2024, 2, 24)),
+    (date(2024, 12, 31), 1, date(2025, 1, 1)),
+    (date(2024, 3, 1), -1, date(2024, 2, 29)),
+])
+def test_add_days_across_month_ends_and_leap_years(start, days, expected):
+    assert add_days(start, days).date() == expected
+    assert add_days_array([np.datetime64(start)], [days]).tolist() == [expected]
+
+
+def test_add_days_array_matches_scalar():
+    expected = [add_days(d, int(o)).date() for d, o in zip(DAYS.tolist(), OFFSETS)]
+    assert add_days_array(DAYS, OFFSETS).tolist() == expected
+
+
+def test_add_days_array_keeps_nat():
+    result = add_days_array(np.array(['2024-02-29', 'NaT'], dtype='datetime64[D]'), [1, 1])
+    assert result[0] == np.datetime64('2024-03-01')
+    assert np.isnat(result[1])
+
+
+@pytest.mark.parametrize('months', [1, 3, 12])
+def test_period_end_array_matches_scalar(months):
+    assert get_term_days_array([months])[0] == get_term_days(months)
+    expected = [calculate_period_end(d, months) for d in DAYS.tolist()]
+    assert calculate_period_end_array(DAYS, np.full(len(DAYS), months)).tolist() == expected
+
+
+def test_utc_conversions_round_trip():
+    assert to_utc_days([to_utc(d) for d in DAYS.tolist()]).tolist() == DAYS.tolist()
+    assert [ts.to_pydatetime() for ts in to_utc_timestamps(DAYS)] == [to_utc(d) for d in DAYS.tolist()]
+
+
+def test_format_ids_matches_generate_id():
+    assert format_ids('EVT', np.array([1, 42]), width=6).tolist() == [
+        generate_id('EVT', 1, 6),
+        generate_id('EVT', 42, 6),
+    ]
+
+
+def test_paid_at_array_matches_scalar():
+    np.random.seed(CONFIG['seed'])
+    expected = [calculate_paid_at(to_utc(d)).date() for d in DAYS.tolist()]
+    np.random.seed(CONFIG['seed'])
+    assert calculate_paid_at_array(DAYS, draw_pay_delays(len(DAYS))).tolist() == expected
+
+
+def test_paid_at_array_is_nat_when_unpaid():
+    assert np.isnat(calculate_paid_at_array(DAYS[:3], [1, 2, 3], is_paid=False)).all()
+
+
+@pytest.mark.parametrize('total_days', [30, 360])
+def test_proration_array_matches_scalar(total_days):
+    old, new = (a.ravel() for a in np.meshgrid(PRICES, PRICES, indexing='ij'))
+    old, new = np.repeat(old, total_days + 1), np.repeat(new, total_days + 1)
+    remaining = np.tile(np.arange(total_days + 1), len(PRICES) ** 2)
+    total = np.full(len(old), total_days)
+
+    credit, charge = calculate_proration_array(old, new, remaining, total)
+    expected = [
+        calculate_proration(*args)
+        for args in zip(old.tolist(), new.tolist(), remaining.tolist(), total.tolist())
+    ]
+    assert list(zip(credit.tolist(), charge.tolist())) == expected
+
+
+@pytest.mark.parametrize('kind', CUSTOMER_DISTRIBUTIONS)
+def test_alias_table_encodes_customer_weights(kind):
+    config = {**CONFIG, 'randomization': {**CONFIG['randomization'], 'customer_distribution': kind}}
+    weights = customer_weights(1000, config)
+    prob, alias = build_alias_table(weights)
+    encoded = prob + np.bincount(alias, weights=1 - prob, minlength=len(prob))
+    assert np.allclose(encoded / len(prob), weights)
@@ -1,11 +1,23 @@
 """
 Shared utility functions for data generation.
-Contains: ID generation, date helpers, proration math, timezone handling.
+Contains: ID generation, date helpers, proration math, timezone handling,
+their array (datetime64 / integer-day) counterparts, customer distribution
+samplers, raw table schemas and CSV/Parquet writers.
+
+tests/test_utils.py checks that every array helper matches its scalar
+version exactly.
 """
 
 from datetime import datetime, timedelta, date, timezone
+import os
 from pathlib import Path
+import shutil
+import numpy as np
+import pandas as pd
 import yaml
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 
 # =============================================================================
@@ -17,8 +29,13 @@ SCRIPT_DIR = Path(__file__).parent
 
 
 def load_config():
-    """Load configuration from config.yml (relative to script location)."""
-    config_path = SCRIPT_DIR / 'config.yml'
+    """
+    Load configuration from config.yml (relative to script location).
+    
+    The DATA_GEN_CONFIG environment variable points to another config file
+    instead (used by scripts/benchmark_pipeline.py for scaled configs).
+    """
+    config_path = Path(os.environ.get('DATA_GEN_CONFIG', SCRIPT_DIR / 'config.yml'))
     with open(config_path, 'r') as f:
         return yaml.safe_load(f)
 
@@ -147,7 +164,6 @@ def calculate_paid_at(issued_at, config=None, is_paid=True):
     if config is None:
         config = CONFIG
     
-    import numpy as np
     min_delay = config['invoices']['pay_delay_days_min']
     max_delay = config['invoices']['pay_delay_days_max']
     delay_days = np.random.randint(min_delay, max_delay + 1)
@@ -185,6 +201,338 @@ def calculate_proration(old_price, new_price, remaining_days, total_days):
     return round(credit, 2), round(charge, 2)
 
 
+# =============================================================================
+# ARRAY HELPERS
+# =============================================================================
+# Counterparts of the scalar helpers above for whole columns at once: dates
+# are datetime64[D] arrays (NaT = missing), day counts are integer arrays.
+# Each returns exactly what the scalar helper returns element by element.
+
+def format_ids(prefix, counters, width=4):
+    """
+    Vectorized generate_id(): format an integer array as ID strings.
+
+    Example:
+        format_ids('EVT', np.array([1, 2]), width=6) -> ['EVT_000001', 'EVT_000002']
+    """
+    digits = np.char.zfill(np.asarray(counters).astype(str), width)
+    return np.char.add(f"{prefix}_", digits).astype(object)
+
+
+def to_utc_days(values):
+    """
+    Array counterpart of to_utc() for day-grain data: dates, datetimes
+    (naive = UTC, aware = converted to UTC) or ISO strings -> datetime64[D].
+    """
+    timestamps = pd.to_datetime(pd.Series(values, dtype=object), utc=True, format='mixed')
+    return timestamps.dt.tz_convert(None).to_numpy().astype('datetime64[D]')
+
+
+def to_utc_timestamps(days):
+    """Convert a datetime64[D] array to tz-aware UTC timestamps (midnight)."""
+    return pd.DatetimeIndex(np.asarray(days).astype('datetime64[s]')).tz_localize('UTC')
+
+
+def add_days_array(days, offsets):
+    """Array counterpart of add_days(): datetime64[D] + integer days (NaT stays NaT)."""
+    return np.asarray(days, dtype='datetime64[D]') + np.asarray(offsets).astype('timedelta64[D]')
+
+
+def get_term_days_array(billing_period_months, config=None):
+    """Array counterpart of get_term_days()."""
+    if config is None:
+        config = CONFIG
+
+    months = np.asarray(billing_period_months)
+    return np.select(
+        [months == 1, months == 12],
+        [config['monthly_term_days'], config['annual_term_days']],
+        default=months * 30
+    )
+
+
+def calculate_period_end_array(start_days, billing_period_months, config=None):
+    """Array counterpart of calculate_period_end(): period end per start date."""
+    return add_days_array(start_days, get_term_days_array(billing_period_months, config))
+
+
+def draw_pay_delays(size, config=None, rng=None):
+    """
+    Pay delays in days, uniform in [pay_delay_days_min, pay_delay_days_max].
+
+    rng defaults to the global np.random state, which yields the same delays
+    as `size` consecutive calculate_paid_at() calls.
+    """
+    if config is None:
+        config = CONFIG
+    if rng is None:
+        rng = np.random
+
+    min_delay = config['invoices']['pay_delay_days_min']
+    max_delay = config['invoices']['pay_delay_days_max']
+    if isinstance(rng, np.random.Generator):
+        return rng.integers(min_delay, max_delay + 1, size)
+    return rng.randint(min_delay, max_delay + 1, size)
+
+
+def calculate_paid_at_array(issued_days, pay_delay_days, is_paid=True):
+    """
+    Array counterpart of calculate_paid_at().
+
+    Args:
+        issued_days: datetime64[D] issue dates
+        pay_delay_days: Integer delays, e.g. from draw_pay_delays()
+        is_paid: Bool or bool array; unpaid rows get NaT
+
+    Returns:
+        datetime64[D] array
+    """
+    paid_at = add_days_array(issued_days, pay_delay_days)
+    return np.where(is_paid, paid_at, np.datetime64('NaT'))
+
+
+def broadcast_scalar(func, *arrays):
+    """
+    Apply a scalar helper to aligned arrays, exactly.
+
+    func is evaluated once per distinct combination of inputs (e.g. a
+    handful of plans x term days) and the results are broadcast back, so
+    every element is exactly what the scalar helper returns - including
+    Python's round(), which NumPy's rounding does not reproduce.
+
+    Returns:
+        One float array per value returned by func (a tuple if func returns
+        a tuple)
+    """
+    keys = np.stack([np.asarray(a, dtype=float) for a in arrays], axis=1)
+    if len(keys) == 0:
+        probe = func(*[1.0] * len(arrays))
+        empty = np.empty(0, dtype=float)
+        return tuple(empty for _ in probe) if isinstance(probe, tuple) else empty
+
+    unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+    results = [func(*key) for key in unique_keys.tolist()]
+    values = np.array(results, dtype=float)[inverse.reshape(-1)]
+    if isinstance(results[0], tuple):
+        return tuple(values[:, i] for i in range(values.shape[1]))
+    return values
+
+
+def calculate_proration_array(old_price, new_price, remaining_days, total_days):
+    """
+    Array counterpart of calculate_proration().
+
+    Returns:
+        tuple: (credit, charge) float arrays
+    """
+    return broadcast_scalar(calculate_proration, old_price, new_price, remaining_days, total_days)
+
+
+# =============================================================================
+# CUSTOMER DISTRIBUTIONS
+# =============================================================================
+# How subscriptions fan out over customers (randomization.customer_distribution).
+# The sampler is built once per customer list; every draw after that is O(1)
+# (Walker's alias method), whether for one subscription or a whole batch.
+
+CUSTOMER_DISTRIBUTIONS = ['uniform', 'zipf', 'whales']
+
+
+def customer_weights(n_customers, config=None):
+    """
+    Probability of each customer (in customer order) to own a subscription.
+
+    - uniform: every customer alike
+    - zipf: the k-th customer weighs 1 / k**zipf_exponent (heavy tail)
+    - whales: the first whale_count customers share whale_share of all
+      subscriptions, the other customers split the rest evenly
+    """
+    if config is None:
+        config = CONFIG
+
+    rand = config['randomization']
+    kind = rand.get('customer_distribution', 'uniform')
+    if kind == 'uniform':
+        weights = np.ones(n_customers)
+    elif kind == 'zipf':
+        weights = np.arange(1, n_customers + 1) ** -float(rand.get('zipf_exponent', 1.1))
+    elif kind == 'whales':
+        whale_count = min(rand.get('whale_count', 10), n_customers)
+        whale_share = rand.get('whale_share', 0.25)
+        if not 0 <= whale_share <= 1:
+            raise ValueError(f"whale_share must be between 0 and 1, got {whale_share}")
+        weights = np.full(n_customers, (1 - whale_share) / max(1, n_customers - whale_count))
+        weights[:whale_count] = whale_share / max(1, whale_count)
+    else:
+        raise ValueError(
+            f"Unknown customer_distribution {kind!r} (expected one of {CUSTOMER_DISTRIBUTIONS})"
+        )
+    return weights / weights.sum()
+
+
+def build_alias_table(probabilities):
+    """
+    Walker/Vose alias table for O(1) draws from a discrete distribution.
+
+    Column i is accepted with probability prob[i], otherwise alias[i] is
+    drawn instead. Built in O(n), once.
+
+    Returns:
+        tuple: (prob, alias) arrays
+    """
+    n = len(probabilities)
+    scaled = (np.asarray(probabilities, dtype=float) * n).tolist()
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] += scaled[less] - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+
+    # Whatever is left is 1.0 up to rounding and keeps prob 1
+    return np.array(prob), np.array(alias)
+
+
+def build_customer_sampler(n_customers, config=None):
+    """
+    Precompute the customer sampler for randomization.customer_distribution.
+
+    Returns:
+        dict with 'size', 'prob' and 'alias' (None for uniform, which needs
+        no table)
+    """
+    if config is None:
+        config = CONFIG
+
+    if config['randomization'].get('customer_distribution', 'uniform') == 'uniform':
+        return {'size': n_customers, 'prob': None, 'alias': None}
+    prob, alias = build_alias_table(customer_weights(n_customers, config))
+    return {'size': n_customers, 'prob': prob, 'alias': alias}
+
+
+def draw_customers(sampler, size=None, rng=None):
+    """
+    Draw customer indices from a build_customer_sampler() sampler.
+
+    size=None draws a single int. rng defaults to the global np.random
+    state; a uniform sampler then consumes it exactly like
+    np.random.choice(customer_ids).
+    """
+    if rng is None:
+        rng = np.random
+
+    integers = rng.integers if isinstance(rng, np.random.Generator) else rng.randint
+    column = integers(0, sampler['size'], size)
+    if sampler['alias'] is None:
+        return column
+
+    accept = rng.random(size) < sampler['prob'][column]
+    drawn = np.where(accept, column, sampler['alias'][column])
+    return int(drawn) if size is None else drawn
+
+
+# =============================================================================
+# RAW TABLE SCHEMAS
+# =============================================================================
+
+TIMESTAMP_UTC = pa.timestamp('us', tz='UTC')
+
+# Explicit Parquet schemas for the six raw tables (column order = CSV order)
+RAW_SCHEMAS = {
+    'raw_customers': pa.schema([
+        ('customer_id', pa.string()),
+        ('customer_name', pa.string()),
+        ('customer_segment', pa.string()),
+        ('country', pa.string()),
+        ('created_at', TIMESTAMP_UTC),
+        ('is_test_account', pa.bool_()),
+    ]),
+    'raw_plans': pa.schema([
+        ('plan_id', pa.string()),
+        ('plan_name', pa.string()),
+        ('currency', pa.string()),
+        ('billing_period_months', pa.int32()),
+        ('price_per_period', pa.float64()),
+        ('mrr_equivalent', pa.float64()),
+        ('is_active', pa.bool_()),
+    ]),
+    'raw_subscriptions': pa.schema([
+        ('subscription_id', pa.string()),
+        ('customer_id', pa.string()),
+        ('plan_id', pa.string()),
+        ('status', pa.string()),
+        ('start_at', TIMESTAMP_UTC),
+        ('canceled_at', TIMESTAMP_UTC),
+        ('pause_start_at', TIMESTAMP_UTC),
+        ('pause_end_at', TIMESTAMP_UTC),
+        ('current_period_start', pa.date32()),
+        ('current_period_end', pa.date32()),
+        ('auto_renew', pa.bool_()),
+        ('created_at', TIMESTAMP_UTC),
+    ]),
+    'raw_subscription_events': pa.schema([
+        ('event_id', pa.string()),
+        ('occurred_at', TIMESTAMP_UTC),
+        ('effective_date', pa.date32()),
+        ('subscription_id', pa.string()),
+        ('customer_id', pa.string()),
+        ('event_type', pa.string()),
+        ('old_plan_id', pa.string()),
+        ('new_plan_id', pa.string()),
+        ('reason', pa.string()),
+    ]),
+    'raw_invoices': pa.schema([
+        ('invoice_id', pa.string()),
+        ('issued_at', TIMESTAMP_UTC),
+        ('paid_at', TIMESTAMP_UTC),
+        ('subscription_id', pa.string()),
+        ('customer_id', pa.string()),
+        ('status', pa.string()),
+        ('currency', pa.string()),
+        ('invoice_period_start', pa.date32()),
+        ('invoice_period_end', pa.date32()),
+        ('total_amount', pa.float64()),
+    ]),
+    'raw_invoice_lines': pa.schema([
+        ('invoice_line_id', pa.string()),
+        ('invoice_id', pa.string()),
+        ('subscription_id', pa.string()),
+        ('customer_id', pa.string()),
+        ('plan_id', pa.string()),
+        ('line_type', pa.string()),
+        ('amount', pa.float64()),
+        ('service_period_start', pa.date32()),
+        ('service_period_end', pa.date32()),
+        ('quantity', pa.int32()),
+        ('description', pa.string()),
+    ]),
+}
+
+# Tables that can be Hive-partitioned by month: {table: (date column, partition column)}
+MONTH_PARTITIONS = {
+    'raw_subscription_events': ('effective_date', 'effective_month'),
+    'raw_invoice_lines': ('service_period_start', 'service_month'),
+}
+
+
+def to_arrow_table(df, table):
+    """
+    Convert a raw table DataFrame to an Arrow table with its explicit schema.
+    
+    Works for both record-built DataFrames (Python dates/datetimes) and the
+    bulk engine's typed frames (datetime64 columns, categoricals).
+    """
+    schema = RAW_SCHEMAS[table]
+    if df.empty:
+        return schema.empty_table()
+    return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+
+
 # =============================================================================
 # FILE I/O
 # =============================================================================
@@ -203,4 +551,92 @@ def save_to_csv(dataframes, output_dir):
     for filename, df in dataframes.items():
         filepath = output_path / filename
         df.to_csv(filepath, index=False)
-        print(f"   Saved {filename} ({len(df)} rows)")
\ No newline at end of file
+        print(f"   Saved {filename} ({len(df)} rows)")
+
+
+def append_to_csv(dataframes, output_dir):
+    """
+    Append DataFrames to CSV files (streaming writes).
+    
+    The header is written only when a file is new or empty, so chunks of
+    the same table can be appended one after another.
+    
+    Args:
+        dataframes: Dict of {filename: DataFrame}
+        output_dir: Path to output directory
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True, parents=True)
+    
+    for filename, df in dataframes.items():
+        filepath = output_path / filename
+        is_new = not filepath.exists() or filepath.stat().st_size == 0
+        df.to_csv(filepath, mode='a', header=is_new, index=False)
+
+
+def write_parquet_part(df, table, output_dir, part_name, partition_by_month=False):
+    """
+    Write one DataFrame as a Parquet part file of a table's directory.
+    
+    Layout is output_dir/<table>/<part_name>.parquet, or with partition_by_month
+    (events and invoice lines only) Hive-style month directories such as
+    output_dir/raw_invoice_lines/service_month=2025-01/<part_name>-0.parquet.
+    """
+    arrow_table = to_arrow_table(df, table)
+    table_dir = Path(output_dir) / table
+    
+    if partition_by_month and table in MONTH_PARTITIONS:
+        date_column, partition_column = MONTH_PARTITIONS[table]
+        month = pc.strftime(arrow_table[date_column], format='%Y-%m')
+        pq.write_to_dataset(
+            arrow_table.append_column(partition_column, month),
+            table_dir,
+            partition_cols=[partition_column],
+            basename_template=f"{part_name}-{{i}}.parquet",
+        )
+    else:
+        table_dir.mkdir(exist_ok=True, parents=True)
+        pq.write_table(arrow_table, table_dir / f"{part_name}.parquet")
+
+
+def clear_table_output(table, output_dir):
+    """Remove a table's previous output in either format (CSV file or Parquet directory)."""
+    output_path = Path(output_dir)
+    (output_path / f"{table}.csv").unlink(missing_ok=True)
+    shutil.rmtree(output_path / table, ignore_errors=True)
+
+
+def save_to_parquet(dataframes, output_dir, partition_by_month=False):
+    """
+    Save DataFrames as Parquet tables with the explicit RAW_SCHEMAS.
+    
+    Args:
+        dataframes: Dict of {table_name: DataFrame}
+        output_dir: Path to output directory
+        partition_by_month: Hive-partition events and invoice lines by month
+    """
+    for table, df in dataframes.items():
+        shutil.rmtree(Path(output_dir) / table, ignore_errors=True)
+        write_parquet_part(df, table, output_dir, 'part-0', partition_by_month)
+        print(f"   Saved {table}/ ({len(df)} rows)")
+
+
+def save_tables(dataframes, output_dir, output_format='csv', partition_by_month=False):
+    """
+    Save raw tables in the requested format, replacing any previous output.
+    
+    Args:
+        dataframes: Dict of {table_name: DataFrame}
+        output_dir: Path to output directory
+        output_format: 'csv' (one <table>.csv each) or 'parquet' (one <table>/ each)
+        partition_by_month: Parquet only, see write_parquet_part()
+    """
+    for table in dataframes:
+        clear_table_output(table, output_dir)
+    
+    if output_format == 'parquet':
+        save_to_parquet(dataframes, output_dir, partition_by_month)
+    else:
+        save_to_csv(
+            {f"{table}.csv": df for table, df in dataframes.items()}, output_dir
+        )
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Scale-factor benchmark for the generate -> load -> dbt build pipeline.
+
+Each scale factor (SF) runs the whole pipeline on a scaled copy of
+data_generation/config.yml in its own work directory, so the dev warehouse
+and output are never touched:
+
+    sizes       random_customers / random_subscriptions x SF
+    date_range  span x (1 + log10(SF))   (SF1 = 1 year, SF10 = 2, SF100 = 3, ...)
+
+Recorded per SF: wall time and peak RSS of generate.py, load_duckdb_raw.py
+(skipped with --target duckdb, which loads during generate) and dbt build,
+per-model execution time from dbt's run_results.json, total test time, and
+the DuckDB file size. Results are appended to a CSV history file
+(one row per step) and compared against a stored baseline; steps slower than
+the baseline by more than --threshold are reported as regressions and make
+the script exit non-zero.
+
+Usage:
+    python scripts/benchmark_pipeline.py
+    python scripts/benchmark_pipeline.py --scale-factors 1 10 100 1000
+    python scripts/benchmark_pipeline.py --scale-factors 1 10 --save-baseline
+    python scripts/benchmark_pipeline.py --generate-args="--engine bulk --format parquet"
+    python scripts/benchmark_pipeline.py --generate-args="--engine bulk --target duckdb"
+"""
+import argparse
+import copy
+import csv
+import json
+import math
+import os
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+
+import yaml
+
+BASE = Path(__file__).resolve().parent.parent
+CONFIG = BASE / "data_generation" / "config.yml"
+WAREHOUSE_DIR = BASE / "warehouse"
+BENCH_DIR = BASE / "benchmarks"
+
+HISTORY_FIELDS = [
+    "run_id", "started_at", "git_sha", "scale_factor", "subscriptions",
+    "step", "seconds", "peak_rss_mb", "duckdb_mb",
+]
+
+PROFILE = """\
+subscription_analytics:
+  target: bench
+  outputs:
+    bench:
+      type: duckdb
+      path: '{path}'
+      threads: {threads}
+"""
+
+
+def scaled_config(config: dict, scale_factor: float, output_dir: Path) -> dict:
+    """Copy of config with sizes x SF and the date range stretched by 1 + log10(SF)."""
+    scaled = copy.deepcopy(config)
+    scaled["output_dir"] = str(output_dir)
+    scaled["sizes"] = {
+        name: max(1, round(size * scale_factor)) for name, size in config["sizes"].items()
+    }
+    start = date.fromisoformat(config["date_range"]["start_date"])
+    end = date.fromisoformat(config["date_range"]["end_date"])
+    span = (end - start).days * (1 + math.log10(max(scale_factor, 1)))
+    scaled["date_range"] = {
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=round(span))).isoformat(),
+    }
+    return scaled
+
+
+def run_step(name: str, command: list, log_path: Path, cwd: Path = BASE,
+             env: dict = None) -> dict:
+    """Run one pipeline step, returning its wall time and peak RSS (child + waited-for descendants)."""
+    print(f"   {name:<10} {shlex.join(command)}")
+    started = time.perf_counter()
+    with open(log_path, "w") as log:
+        proc = subprocess.Popen(command, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+    seconds = time.perf_counter() - started
+    returncode = os.waitstatus_to_exitcode(status)
+    if returncode != 0:
+        raise SystemExit(f"{name} failed with exit code {returncode}, see {log_path}")
+    # ru_maxrss is in kilobytes on Linux
+    return {"step": name, "seconds": seconds, "peak_rss_mb": usage.ru_maxrss / 1024}
+
+
+def dbt_node_timings(run_results: Path) -> list:
+    """Per-model execution times plus the summed test time from run_results.json."""
+    results = json.loads(run_results.read_text())["results"]
+    rows = []
+    test_seconds = 0.0
+    for result in results:
+        resource_type, _, name = result["unique_id"].partition(".")
+        if resource_type == "model":
+            rows.append({"step": f"model:{name.split('.')[-1]}",
+                         "seconds": result["execution_time"]})
+        elif resource_type == "test":
+            test_seconds += result["execution_time"]
+    rows.append({"step": "dbt_tests", "seconds": test_seconds})
+    return rows
+
+
+def run_scale_factor(config: dict, scale_factor: float, args: argparse.Namespace) -> list:
+    """Run the pipeline once at scale_factor in a fresh work directory."""
+    work_dir = args.work_dir / f"sf{scale_factor:g}"
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+    output_dir = work_dir / "output"
+    database = work_dir / "warehouse.duckdb"
+
+    scaled = scaled_config(config, scale_factor, output_dir)
+    config_path = work_dir / "config.yml"
+    config_path.write_text(yaml.safe_dump(scaled, sort_keys=False))
+    (work_dir / "profiles.yml").write_text(PROFILE.format(path=database, threads=args.threads))
+
+    print(f"\nSF{scale_factor:g}: {scaled['sizes']['random_subscriptions']:,} subscriptions, "
+          f"{scaled['date_range']['start_date']} to {scaled['date_range']['end_date']}")
+
+    env = {**os.environ, "DATA_GEN_CONFIG": str(config_path)}
+    generate_args = shlex.split(args.generate_args)
+    steps = [
+        run_step("generate",
+                 [sys.executable, "data_generation/generate.py", *generate_args,
+                  "--warehouse", str(database)],
+                 work_dir / "generate.log", env=env),
+    ]
+    # --target duckdb loads the raw schema during generate (no files to load)
+    if "duckdb" not in generate_args:
+        steps.append(run_step("load",
+                              [sys.executable, "scripts/load_duckdb_raw.py",
+                               "--input-dir", str(output_dir), "--warehouse", str(database)],
+                              work_dir / "load.log"))
+    steps += [
+        run_step("dbt_build",
+                 ["dbt", "build", "--profiles-dir", str(work_dir),
+                  "--target-path", str(work_dir / "target"),
+                  "--log-path", str(work_dir / "logs"), *shlex.split(args.dbt_args)],
+                 work_dir / "dbt.log", cwd=WAREHOUSE_DIR),
+    ]
+    steps += dbt_node_timings(work_dir / "target" / "run_results.json")
+
+    duckdb_mb = sum(
+        path.stat().st_size for path in work_dir.glob("warehouse.duckdb*")
+    ) / 1024 ** 2
+    for step in steps:
+        step.update({
+            "scale_factor": f"{scale_factor:g}",
+            "subscriptions": scaled["sizes"]["random_subscriptions"],
+            "duckdb_mb": round(duckdb_mb, 2),
+        })
+    if not args.keep:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        database.unlink(missing_ok=True)
+    return steps
+
+
+def git_sha() -> str:
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE,
+                            capture_output=True, text=True)
+    return result.stdout.strip() or "unknown"
+
+
+def append_history(history: Path, rows: list) -> None:
+    history.parent.mkdir(parents=True, exist_ok=True)
+    is_new = not history.exists() or history.stat().st_size == 0
+    with open(history, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+        if is_new:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({
+                **row,
+                "seconds": round(row["seconds"], 3),
+                "peak_rss_mb": round(row["peak_rss_mb"], 1) if "peak_rss_mb" in row else "",
+            })
+
+
+def save_baseline(baseline: Path, rows: list) -> None:
+    """Store {scale_factor: {step: seconds}} as the new comparison baseline."""
+    data = {"run_id": rows[0]["run_id"], "git_sha": rows[0]["git_sha"], "seconds": {}}
+    for row in rows:
+        data["seconds"].setdefault(row["scale_factor"], {})[row["step"]] = round(row["seconds"], 3)
+    baseline.parent.mkdir(parents=True, exist_ok=True)
+    baseline.write_text(json.dumps(data, indent=2) + "\n")
+    print(f"\nSaved baseline to {os.path.relpath(baseline, BASE)}")
+
+
+def compare(baseline: Path, rows: list, threshold: float, min_seconds: float) -> list:
+    """Print current vs baseline per step (slowest ratios first) and return the regressions."""
+    stored = json.loads(baseline.read_text())
+    print(f"\nComparison against baseline {stored['run_id']} ({stored['git_sha']})")
+    print(f"   {'SF':>5}  {'step':<42} {'baseline':>9} {'current':>9} {'ratio':>7}")
+
+    compared = []
+    for row in rows:
+        before = stored["seconds"].get(row["scale_factor"], {}).get(row["step"])
+        if before is None or max(before, row["seconds"]) < min_seconds:
+            continue
+        compared.append((row["seconds"] / max(before, 1e-9), before, row))
+
+    regressions = []
+    for ratio, before, row in sorted(compared, key=lambda item: item[0], reverse=True):
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(row)
+        print(f"   {row['scale_factor']:>5}  {row['step']:<42} {before:>8.2f}s "
+              f"{row['seconds']:>8.2f}s {ratio:>6.2f}x{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline at several scale factors")
+    parser.add_argument("--scale-factors", type=float, nargs="+", default=[1, 10],
+                        help="Multipliers for config.yml sizes (default: 1 10)")
+    parser.add_argument("--generate-args", default="--engine bulk",
+                        help="Extra arguments for generate.py (default: '--engine bulk')")
+    parser.add_argument("--dbt-args", default="",
+                        help="Extra arguments for dbt build, e.g. '--exclude test_type:data'")
+    parser.add_argument("--threads", type=int, default=4, help="dbt threads (default: 4)")
+    parser.add_argument("--work-dir", type=Path, default=BENCH_DIR / "runs",
+                        help="Scratch directory for generated data and databases")
+    parser.add_argument("--keep", action="store_true",
+                        help="Keep generated data and databases after each run")
+    parser.add_argument("--history", type=Path, default=BENCH_DIR / "history.csv",
+                        help="CSV file the results are appended to")
+    parser.add_argument("--baseline", type=Path, default=BENCH_DIR / "baseline.json",
+                        help="Baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Slowdown ratio above which a step counts as a regression "
+                             "(default: 0.2 = 20%%)")
+    parser.add_argument("--min-seconds", type=float, default=1.0,
+                        help="Ignore steps faster than this in both runs (timer noise)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = yaml.safe_load(CONFIG.read_text())
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_info = {"run_id": run_id, "started_at": datetime.now(timezone.utc).isoformat(),
+                "git_sha": git_sha()}
+
+    rows = []
+    for scale_factor in args.scale_factors:
+        for step in run_scale_factor(config, scale_factor, args):
+            rows.append({**run_info, **step})
+        summary = [row for row in rows if row["scale_factor"] == f"{scale_factor:g}"]
+        for row in summary:
+            if "peak_rss_mb" in row:
+                print(f"   {row['step']:<10} {row['seconds']:8.2f}s  "
+                      f"peak RSS {row['peak_rss_mb']:8.1f} MB")
+        print(f"   DuckDB file {summary[0]['duckdb_mb']:.1f} MB")
+
+    append_history(args.history, rows)
+    print(f"\nAppended {len(rows)} rows to {os.path.relpath(args.history, BASE)}")
+
+    regressions = []
+    if args.save_baseline:
+        save_baseline(args.baseline, rows)
+    elif args.baseline.exists():
+        regressions = compare(args.baseline, rows, args.threshold, args.min_seconds)
+    else:
+        print(f"\nNo baseline at {os.path.relpath(args.baseline, BASE)} "
+              "(use --save-baseline to create one)")
+
+    if regressions:
+        raise SystemExit(f"{len(regressions)} step(s) regressed by more than "
+                         f"{args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Export the dbt marts to Hive-partitioned Parquet for BI tools and notebooks.
+
+Every mart in EXPORTS is written below the export directory as zstd-compressed
+Parquet, sorted on its keys and with large row groups, so readers can prune on
+the sort keys and skip whole months:
+
+    <export-dir>/fct_mrr_daily/date_month=2025-01/data_0.parquet
+    <export-dir>/dim_customer/data_0.parquet
+
+Facts are partitioned by month of their date column; dims are one file each.
+
+Only partitions whose content changed since the last export are rewritten.
+Each partition's fingerprint (row count + order-independent sum of row hashes)
+is kept in <export-dir>/_export_state.json; partitions that disappeared are
+deleted. A changed column list or DuckDB version rewrites the whole table.
+Changed partitions are written in one sorted pass into a staging directory
+and renamed into place, so readers never see a half-written partition.
+
+Read an export with e.g.
+    read_parquet('exports/marts/fct_mrr_daily/**/*.parquet', hive_partitioning = true)
+
+Usage:
+    python scripts/export_marts_parquet.py
+    python scripts/export_marts_parquet.py --full-refresh
+    python scripts/export_marts_parquet.py --select fct_mrr_daily dim_customer
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+import shutil
+import time
+
+import duckdb
+
+BASE = Path(__file__).resolve().parent.parent
+WAREHOUSE = BASE / "warehouse" / "warehouse.duckdb"
+EXPORT_DIR = BASE / "exports" / "marts"
+MARTS_SCHEMA = "main_marts"
+
+# Per mart: month partition (date column, partition column) and sort keys.
+# Sorting on the filter/join keys keeps row group min/max statistics tight.
+EXPORTS = {
+    "fct_mrr_daily": {
+        "partition": ("date_day", "date_month"),
+        "sort": ["date_day", "customer_id", "subscription_id"],
+    },
+    "fct_mrr_segments": {
+        "partition": ("valid_from", "valid_from_month"),
+        "sort": ["valid_from", "customer_id", "subscription_id"],
+    },
+    "fct_invoice_lines": {
+        "partition": ("service_period_start", "service_month"),
+        "sort": ["service_period_start", "customer_id", "invoice_id", "invoice_line_id"],
+    },
+    "fct_subscription_events": {
+        "partition": ("effective_date", "effective_month"),
+        "sort": ["effective_date", "subscription_id", "occurred_at", "event_id"],
+    },
+    "fct_mrr_rollup_daily": {
+        "partition": ("date_day", "date_month"),
+        "sort": ["date_day", "rollup_level", "plan_id", "customer_segment", "country"],
+    },
+    "fct_mrr_rollup_month_end": {
+        "sort": ["month_start_date", "rollup_level", "plan_id", "customer_segment", "country"],
+    },
+    "dim_customer": {"sort": ["customer_id"]},
+    "dim_date": {"sort": ["date_day"]},
+    "dim_plan": {"sort": ["plan_id"]},
+    "dim_subscription": {"sort": ["subscription_id"]},
+}
+
+# 120 DuckDB vectors: large enough for efficient scans, small enough that a
+# month of a fact table still has several groups to prune
+ROW_GROUP_SIZE = 245_760
+COMPRESSION_LEVEL = 9
+
+# Partition value for NULL dates (Hive convention)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# Key of the single "partition" of an unpartitioned table
+WHOLE_TABLE = "*"
+
+STATE_FILE = "_export_state.json"
+
+
+def partition_sql(table: str) -> str:
+    """Partition value of a row as SQL ('YYYY-MM', NULL_PARTITION or WHOLE_TABLE)."""
+    if "partition" not in EXPORTS[table]:
+        return f"'{WHOLE_TABLE}'"
+    date_column, _ = EXPORTS[table]["partition"]
+    return f"coalesce(strftime({date_column}, '%Y-%m'), '{NULL_PARTITION}')"
+
+
+def table_columns(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> list:
+    """[name:type, ...] of a table, in column order."""
+    return [
+        f"{name}:{dtype}"
+        for name, dtype in conn.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_schema = ? AND table_name = ? ORDER BY ordinal_position",
+            [schema, table],
+        ).fetchall()
+    ]
+
+
+def partition_fingerprints(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> dict:
+    """{partition: 'rows:hash sum'} per partition of schema.table."""
+    rows = conn.execute(
+        f"""
+        SELECT
+            {partition_sql(table)} AS partition,
+            count(*) AS row_count,
+            sum(hash(source))::VARCHAR AS row_hash_sum
+        FROM {schema}.{table} AS source
+        GROUP BY ALL
+        """
+    ).fetchall()
+    return {partition: f"{row_count}:{row_hash_sum}" for partition, row_count, row_hash_sum in rows}
+
+
+def partition_dir(export_dir: Path, table: str, partition: str) -> Path:
+    """Directory holding the Parquet file(s) of one partition (or of the whole table)."""
+    if partition == WHOLE_TABLE:
+        return export_dir / table
+    _, partition_column = EXPORTS[table]["partition"]
+    return export_dir / table / f"{partition_column}={partition}"
+
+
+def replace_dir(staged: Path, target: Path) -> None:
+    """Move a staged directory into place, replacing target."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    trash = target.with_name(f".{target.name}.old-{os.getpid()}")
+    if target.exists():
+        target.rename(trash)
+    staged.rename(target)
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+def write_partitions(conn: duckdb.DuckDBPyConnection, schema: str, table: str,
+                     partitions: list, export_dir: Path, row_group_size: int) -> None:
+    """
+    Write the given partitions of a mart in one sorted pass.
+
+    DuckDB splits the rows by partition (PARTITION_BY) into a staging
+    directory; each staged partition then replaces its exported directory.
+    """
+    staging = export_dir / f".{table}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    order_by = ", ".join(EXPORTS[table]["sort"])
+    options = (
+        f"FORMAT parquet, COMPRESSION zstd, COMPRESSION_LEVEL {COMPRESSION_LEVEL}, "
+        f"ROW_GROUP_SIZE {row_group_size}"
+    )
+
+    if "partition" in EXPORTS[table]:
+        _, partition_column = EXPORTS[table]["partition"]
+        conn.execute(
+            f"""
+            COPY (
+                SELECT *, {partition_sql(table)} AS {partition_column}
+                FROM {schema}.{table}
+                WHERE {partition_sql(table)} IN (SELECT unnest(?::VARCHAR[]))
+                ORDER BY {order_by}
+            ) TO '{staging}' (
+                {options}, PARTITION_BY ({partition_column}), FILENAME_PATTERN 'data_{{i}}'
+            )
+            """,
+            [partitions],
+        )
+        for partition in partitions:
+            replace_dir(staging / f"{partition_column}={partition}",
+                        partition_dir(export_dir, table, partition))
+        shutil.rmtree(staging)
+    else:
+        conn.execute(
+            f"""
+            COPY (
+                SELECT * FROM {schema}.{table} ORDER BY {order_by}
+            ) TO '{staging / "data_0.parquet"}' ({options})
+            """
+        )
+        replace_dir(staging, partition_dir(export_dir, table, WHOLE_TABLE))
+
+
+def remove_partition(export_dir: Path, table: str, partition: str) -> None:
+    """Delete a partition that no longer exists in the mart."""
+    shutil.rmtree(partition_dir(export_dir, table, partition), ignore_errors=True)
+
+
+def load_state(export_dir: Path) -> dict:
+    state_path = export_dir / STATE_FILE
+    if not state_path.exists():
+        return {"tables": {}}
+    return json.loads(state_path.read_text())
+
+
+def save_state(export_dir: Path, state: dict) -> None:
+    """Write the export state atomically (after every table)."""
+    state_path = export_dir / STATE_FILE
+    staging = state_path.with_name(f".{STATE_FILE}.tmp-{os.getpid()}")
+    staging.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+    staging.replace(state_path)
+
+
+def export_table(conn: duckdb.DuckDBPyConnection, schema: str, table: str,
+                 export_dir: Path, previous: dict, full_refresh: bool,
+                 row_group_size: int) -> dict:
+    """
+    Rewrite the changed partitions of one mart.
+
+    Returns:
+        New state entry {'columns', 'duckdb_version', 'partitions'} for the table
+    """
+    started = time.perf_counter()
+    columns = table_columns(conn, schema, table)
+    fingerprints = partition_fingerprints(conn, schema, table)
+
+    if (full_refresh or previous.get("columns") != columns
+            or previous.get("duckdb_version") != duckdb.__version__):
+        shutil.rmtree(export_dir / table, ignore_errors=True)
+        old_fingerprints = {}
+    else:
+        old_fingerprints = previous.get("partitions", {})
+
+    changed = [
+        partition for partition, fingerprint in sorted(fingerprints.items())
+        if old_fingerprints.get(partition) != fingerprint
+        or not any(partition_dir(export_dir, table, partition).glob("*.parquet"))
+    ]
+    removed = sorted(set(old_fingerprints) - set(fingerprints))
+
+    if changed:
+        write_partitions(conn, schema, table, changed, export_dir, row_group_size)
+    for partition in removed:
+        remove_partition(export_dir, table, partition)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Exported {table:<24} {len(changed):>4} of {len(fingerprints):>4} partitions rewritten, "
+        f"{len(removed)} removed in {elapsed:6.2f}s"
+    )
+    return {"columns": columns, "duckdb_version": duckdb.__version__, "partitions": fingerprints}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export dbt marts to partitioned Parquet")
+    parser.add_argument("--warehouse", type=Path, default=WAREHOUSE,
+                        help="DuckDB database file holding the marts")
+    parser.add_argument("--schema", default=MARTS_SCHEMA,
+                        help=f"Schema of the mart tables (default: {MARTS_SCHEMA})")
+    parser.add_argument("--export-dir", type=Path, default=EXPORT_DIR,
+                        help="Directory for the Parquet export")
+    parser.add_argument("--select", nargs="+", choices=list(EXPORTS), default=list(EXPORTS),
+                        metavar="MART", help="Marts to export (default: all)")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Rewrite every partition, ignoring the export state")
+    parser.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE,
+                        help=f"Rows per Parquet row group (default: {ROW_GROUP_SIZE:,})")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.warehouse.exists():
+        raise SystemExit(f"Missing warehouse {args.warehouse} (run dbt build first)")
+    args.export_dir.mkdir(parents=True, exist_ok=True)
+
+    conn = duckdb.connect(str(args.warehouse), read_only=True)
+    state = load_state(args.export_dir)
+
+    for table in args.select:
+        state["tables"][table] = export_table(
+            conn, args.schema, table, args.export_dir,
+            state["tables"].get(table, {}), args.full_refresh, args.row_group_size,
+        )
+        save_state(args.export_dir, state)
+
+    conn.close()
+    print(f"Done. Export in {os.path.relpath(args.export_dir, BASE)}/")
+
+
+if __name__ == "__main__":
+    main()
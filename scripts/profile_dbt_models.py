@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Per-model DuckDB query profiling for the dbt warehouse.
+
+dbt logs only report the total time per model. This wrapper compiles the
+selected models, re-runs each compiled query against the built warehouse with
+DuckDB's JSON profiling enabled (into a temp table, so nothing in the database
+changes) and collects operator timings, cardinalities and memory:
+
+    warehouse/target/profiles/<model>.json    raw DuckDB profile per model
+    warehouse/target/profiles/operators.csv   every operator of every model
+    ranked hot-spot report on stdout          slowest models and operators
+
+Run it after `dbt build` (or pass --build). Incremental models are profiled as
+compiled for the current state; use --full-refresh to profile a full rebuild.
+
+Usage:
+    python scripts/profile_dbt_models.py
+    python scripts/profile_dbt_models.py --build --full-refresh
+    python scripts/profile_dbt_models.py --select int_mrr_segments+ --top 25
+"""
+import argparse
+import csv
+import json
+import os
+from pathlib import Path
+import shlex
+import subprocess
+import time
+
+import duckdb
+
+BASE = Path(__file__).resolve().parent.parent
+WAREHOUSE_DIR = BASE / "warehouse"
+WAREHOUSE = WAREHOUSE_DIR / "warehouse.duckdb"
+
+PROFILED_TABLE = "profiled_model"
+
+PROFILING_METRICS = json.dumps({
+    metric: "true" for metric in (
+        "LATENCY", "ROWS_RETURNED", "SYSTEM_PEAK_BUFFER_MEMORY", "OPERATOR_TYPE",
+        "OPERATOR_TIMING", "OPERATOR_CARDINALITY", "OPERATOR_ROWS_SCANNED",
+        "RESULT_SET_SIZE", "EXTRA_INFO",
+    )
+})
+
+OPERATOR_FIELDS = [
+    "model", "depth", "operator", "seconds", "share_of_model", "cardinality",
+    "rows_scanned", "result_mb", "detail",
+]
+
+
+def dbt(command: str, args: argparse.Namespace) -> None:
+    """Run a dbt command for the selected models in the warehouse project."""
+    cmd = ["dbt", command, "--select", args.select, *shlex.split(args.dbt_args)]
+    if args.full_refresh:
+        cmd.append("--full-refresh")
+    print(f"Running {shlex.join(cmd)}")
+    subprocess.run(cmd, cwd=WAREHOUSE_DIR, check=True,
+                   stdout=None if command == "build" else subprocess.DEVNULL)
+
+
+def compiled_models(manifest_path: Path) -> dict:
+    """Compiled SQL per model name for the nodes compiled in the last dbt invocation."""
+    nodes = json.loads(manifest_path.read_text())["nodes"].values()
+    return {
+        node["name"]: node["compiled_code"]
+        for node in nodes
+        if node["resource_type"] == "model" and node.get("compiled") and node.get("compiled_code")
+    }
+
+
+def profile_model(conn: duckdb.DuckDBPyConnection, sql: str, output: Path) -> dict:
+    """Run one compiled model into a temp table with JSON profiling written to output."""
+    conn.execute("PRAGMA enable_profiling = 'json'")
+    conn.execute(f"PRAGMA profiling_output = '{output}'")
+    conn.execute(f"SET custom_profiling_settings = '{PROFILING_METRICS}'")
+    started = time.perf_counter()
+    conn.execute(f"CREATE OR REPLACE TEMP TABLE {PROFILED_TABLE} AS {sql}")
+    elapsed = time.perf_counter() - started
+    conn.execute("PRAGMA disable_profiling")
+    rows = conn.execute(f"SELECT count(*) FROM {PROFILED_TABLE}").fetchone()[0]
+    conn.execute(f"DROP TABLE {PROFILED_TABLE}")
+    return {"seconds": elapsed, "rows": rows, "profile": json.loads(output.read_text())}
+
+
+def operator_detail(extra_info: dict) -> str:
+    """Short description of an operator: join conditions, scanned table, filters, groups."""
+    parts = []
+    if "Join Type" in extra_info:
+        parts.append(extra_info["Join Type"])
+    keys = ("Conditions", "Condition", "CTE Name", "Table", "Function", "Filters",
+            "Expression", "Groups", "Aggregates")
+    if "Aggregates" not in extra_info and "OVER (" in str(extra_info.get("Projections")):
+        keys += ("Projections",)  # window functions
+    for key in keys:
+        value = extra_info.get(key)
+        if value:
+            parts.append(" AND ".join(value) if isinstance(value, list) else str(value))
+    return " | ".join(parts).replace("\n", " ")
+
+
+def flatten_operators(model: str, profile: dict) -> list:
+    """One row per operator in the profile tree, depth-first."""
+    latency = profile.get("latency") or 0
+    rows = []
+
+    def walk(node: dict, depth: int) -> None:
+        seconds = node.get("operator_timing", 0)
+        rows.append({
+            "model": model,
+            "depth": depth,
+            "operator": node.get("operator_type") or node.get("operator_name"),
+            "seconds": seconds,
+            "share_of_model": seconds / latency if latency else 0,
+            "cardinality": node.get("operator_cardinality", 0),
+            "rows_scanned": node.get("operator_rows_scanned", 0),
+            "result_mb": node.get("result_set_size", 0) / 1024 ** 2,
+            "detail": operator_detail(node.get("extra_info") or {}),
+        })
+        for child in node.get("children", []):
+            walk(child, depth + 1)
+
+    for child in profile.get("children", []):
+        walk(child, 0)
+    return rows
+
+
+def write_operators(path: Path, operators: list) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=OPERATOR_FIELDS)
+        writer.writeheader()
+        for row in operators:
+            writer.writerow({
+                **row,
+                "seconds": round(row["seconds"], 6),
+                "share_of_model": round(row["share_of_model"], 4),
+                "result_mb": round(row["result_mb"], 3),
+            })
+
+
+def print_report(summaries: list, operators: list, top: int) -> None:
+    total = sum(summary["seconds"] for summary in summaries) or 1e-9
+
+    print(f"\nSlowest models (total {total:.2f}s)")
+    print(f"   {'model':<40} {'seconds':>8} {'share':>6} {'rows':>12} {'peak MB':>9}")
+    for summary in sorted(summaries, key=lambda s: s["seconds"], reverse=True)[:top]:
+        print(f"   {summary['model']:<40} {summary['seconds']:>8.2f} "
+              f"{summary['seconds'] / total:>6.1%} {summary['rows']:>12,} "
+              f"{summary['peak_mb']:>9.1f}")
+
+    print("\nHottest operators")
+    print(f"   {'model':<32} {'operator':<22} {'seconds':>8} {'of model':>8} "
+          f"{'rows out':>12}  detail")
+    for row in sorted(operators, key=lambda r: r["seconds"], reverse=True)[:top]:
+        print(f"   {row['model']:<32} {row['operator']:<22} {row['seconds']:>8.3f} "
+              f"{row['share_of_model']:>8.1%} {row['cardinality']:>12,}  {row['detail'][:90]}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Profile dbt models with DuckDB's JSON profiler")
+    parser.add_argument("--select", "-s", default="resource_type:model",
+                        help="dbt selector for the models to profile (default: all models)")
+    parser.add_argument("--build", action="store_true",
+                        help="Run dbt build for the selection first")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Compile incremental models as a full rebuild")
+    parser.add_argument("--dbt-args", default="",
+                        help="Extra arguments for dbt, e.g. '--target dev'")
+    parser.add_argument("--warehouse", type=Path, default=WAREHOUSE,
+                        help="DuckDB database the models were built in")
+    parser.add_argument("--output-dir", type=Path, default=WAREHOUSE_DIR / "target" / "profiles",
+                        help="Where to write the per-model profiles and operators.csv")
+    parser.add_argument("--top", type=int, default=15,
+                        help="Rows per ranking in the report (default: 15)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.build:
+        dbt("build", args)
+    dbt("compile", args)
+    models = compiled_models(WAREHOUSE_DIR / "target" / "manifest.json")
+    if not models:
+        raise SystemExit(f"No models compiled for --select {args.select}")
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(args.warehouse))
+
+    summaries, operators = [], []
+    for model, sql in models.items():
+        result = profile_model(conn, sql, args.output_dir / f"{model}.json")
+        profile = result["profile"]
+        summaries.append({
+            "model": model,
+            "seconds": result["seconds"],
+            "rows": result["rows"],
+            "peak_mb": profile.get("system_peak_buffer_memory", 0) / 1024 ** 2,
+        })
+        operators += flatten_operators(model, profile)
+        print(f"   {model:<40} {result['seconds']:8.2f}s")
+
+    write_operators(args.output_dir / "operators.csv", operators)
+    print_report(summaries, operators, args.top)
+    print(f"\nProfiles written to {os.path.relpath(args.output_dir, BASE)}/")
+
+
+if __name__ == "__main__":
+    main()
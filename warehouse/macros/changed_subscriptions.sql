@@ -0,0 +1,127 @@
+{#-
+Change detection for the incremental subscription-grain models.
+
+Each incremental model keeps a sidecar table <model>__subscription_state
+next to int_subscription_fingerprints (intermediate schema), one row per
+subscription it has built: the source fingerprint, customer and first/last
+day of its rows. The model itself carries no change-detection columns.
+
+    changed_subscriptions()        subscriptions to rebuild on this run
+    delete_stale_subscriptions()   post-hook: drop subscriptions without rows on this run
+    save_subscription_state()      post-hook: record what the run built
+-#}
+
+{% macro subscription_state_relation(model_relation=none) %}
+    {#- Sidecar state table of an incremental model (default: this model). -#}
+    {%- set fingerprints = ref('int_subscription_fingerprints') -%}
+    {%- set model_relation = model_relation or this -%}
+    {{ return(api.Relation.create(
+        database=fingerprints.database,
+        schema=fingerprints.schema,
+        identifier=model_relation.identifier ~ '__subscription_state'
+    )) }}
+{% endmacro %}
+
+
+{% macro load_subscription_state(model_relation=none) %}
+    {#- The sidecar state table if it exists, else none. -#}
+    {%- set state = subscription_state_relation(model_relation) -%}
+    {{ return(adapter.get_relation(
+        database=state.database, schema=state.schema, identifier=state.identifier
+    )) }}
+{% endmacro %}
+
+
+{% macro changed_subscriptions() %}
+    {#-
+    Subquery of subscription_ids whose current source fingerprint
+    (int_subscription_fingerprints) is not the one recorded for {{ this }}:
+    new subscriptions, new or edited events, snapshot updates, a moved
+    coverage window. Only valid inside an is_incremental() block; without a
+    recorded state every subscription counts as changed.
+    -#}
+    {%- set state = load_subscription_state() -%}
+    select fingerprints.subscription_id
+    from {{ ref('int_subscription_fingerprints') }} fingerprints
+    {%- if state is not none %}
+    left join {{ state }} loaded
+        on loaded.subscription_id = fingerprints.subscription_id
+        and loaded.source_fingerprint = fingerprints.source_fingerprint
+    where loaded.subscription_id is null
+    {%- endif %}
+{% endmacro %}
+
+
+{% macro delete_stale_subscriptions(source_relation) %}
+    {#-
+    Post-hook: delete+insert only replaces subscriptions that produced rows
+    on this run. Rows of subscriptions that left the source, and of changed
+    subscriptions that no longer have any rows in source_relation (e.g. a
+    cancellation moved before the start), are deleted here.
+    -#}
+    {%- if is_incremental() %}
+    delete from {{ this }}
+    where subscription_id not in (
+            select subscription_id from {{ ref('int_subscription_fingerprints') }}
+        )
+        or (
+            subscription_id in ({{ changed_subscriptions() }})
+            and subscription_id not in (
+                select rebuilt.subscription_id
+                from {{ source_relation }} rebuilt
+                where rebuilt.subscription_id in ({{ changed_subscriptions() }})
+            )
+        )
+    {%- endif %}
+{% endmacro %}
+
+
+{% macro save_subscription_state() %}
+    {#-
+    Post-hook: bring the sidecar state in line with the rows now in {{ this }}.
+    Rows of changed or removed subscriptions are dropped and the rebuilt
+    subscriptions recorded again; a full build records every subscription.
+    -#}
+    {%- set fingerprints = ref('int_subscription_fingerprints') -%}
+    {%- set state = subscription_state_relation() -%}
+    {%- set rebuild = load_subscription_state() is none or should_full_refresh() -%}
+    {%- set built_rows -%}
+        select
+            subscription_id,
+            any_value(customer_id) as customer_id,
+            min(date_day) as first_day,
+            max(date_day) as last_day
+        from {{ this }}
+        {%- if not rebuild %}
+        where subscription_id not in (select subscription_id from {{ state }})
+        {%- endif %}
+        group by subscription_id
+    {%- endset -%}
+
+    {%- if rebuild %}
+    create or replace table {{ state }} as
+    {%- else %}
+    delete from {{ state }}
+    where subscription_id not in (
+        select loaded.subscription_id
+        from {{ state }} loaded
+        inner join {{ fingerprints }} fingerprints
+            on fingerprints.subscription_id = loaded.subscription_id
+            and fingerprints.source_fingerprint = loaded.source_fingerprint
+    );
+
+    insert into {{ state }}
+    {%- endif %}
+    select
+        fingerprints.subscription_id,
+        fingerprints.source_fingerprint,
+        built.customer_id,
+        built.first_day,
+        built.last_day
+    from {{ fingerprints }} fingerprints
+    left join ({{ built_rows }}) built
+        on built.subscription_id = fingerprints.subscription_id
+    {%- if not rebuild %}
+    where fingerprints.subscription_id not in (select subscription_id from {{ state }})
+    {%- endif %}
+{% endmacro %}
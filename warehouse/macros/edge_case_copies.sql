@@ -0,0 +1,24 @@
+{% macro edge_case_copies(scenario_id) %}
+    {#-
+    Every copy of one deterministic edge case scenario: the golden
+    subscription itself plus the replicas written by
+    generate.py --edge-case-copies (IDs <scenario>_R000001, ...), with the
+    number of days each copy is shifted against the golden dates.
+
+    Args:
+        scenario_id: Golden subscription ID, e.g. 'S001'
+
+    Usage:
+        from {{ ref('fct_mrr_daily') }} daily
+        inner join ({{ edge_case_copies('S003') }}) copies
+            on copies.subscription_id = daily.subscription_id
+        where daily.date_day >= date '2025-01-20' + copies.shift_days
+    -#}
+    select
+        copies.subscription_id,
+        cast(datediff('day', golden.started_at, copies.started_at) as integer) as shift_days
+    from {{ ref('stg_subscriptions') }} as copies
+    inner join {{ ref('stg_subscriptions') }} as golden
+        on golden.subscription_id = '{{ scenario_id }}'
+    where split_part(copies.subscription_id, '_', 1) = '{{ scenario_id }}'
+{% endmacro %}
@@ -0,0 +1,114 @@
+{% macro fused_schema_tests(models=none) %}
+    {#-
+    Run every not_null, unique, accepted_values and relationships test as one
+    aggregate query per tested model or source instead of one query per test,
+    and report each test's result individually. Failures are offending rows
+    (for unique: rows beyond the first per value). Tests with severity warn
+    only warn; any error-severity failure fails the operation.
+
+    Args:
+        models: Optional list of model/source names to restrict the run to
+
+    Usage:
+        dbt build --exclude "test_name:not_null test_name:unique test_name:accepted_values test_name:relationships"
+        dbt run-operation fused_schema_tests
+        dbt run-operation fused_schema_tests --args '{models: [int_mrr_segments]}'
+    -#}
+    {%- if not execute -%}
+        {{ return('') }}
+    {%- endif -%}
+
+    {%- set fusable = ['not_null', 'unique', 'accepted_values', 'relationships'] -%}
+    {%- set groups = {} -%}
+    {%- for test in graph.nodes.values()
+        if test.resource_type == 'test'
+        and test.test_metadata
+        and test.test_metadata.namespace is none
+        and test.test_metadata.name in fusable -%}
+        {%- set target_id = test.attached_node or (test.depends_on.nodes | select('in', graph.sources.keys() | list) | first) -%}
+        {%- set target = graph.nodes.get(target_id) or graph.sources.get(target_id) -%}
+        {%- if target and (models is none or target.name in models) -%}
+            {%- do groups.setdefault(target_id, []).append(test) -%}
+        {%- endif -%}
+    {%- endfor -%}
+
+    {%- set totals = {'tests': 0, 'failed': 0, 'warned': 0} -%}
+    {%- for target_id, tests in groups.items() -%}
+        {%- set checks = [] -%}
+        {%- set joins = [] -%}
+        {%- for test in tests -%}
+            {%- set kwargs = test.test_metadata.kwargs -%}
+            {%- set column = kwargs.column_name -%}
+            {%- set scope = '(' ~ test.config.where ~ ')' if test.config.where else 'true' -%}
+            {%- set name = test.test_metadata.name -%}
+            {%- if name == 'not_null' -%}
+                {%- do checks.append('count(*) filter (where ' ~ scope ~ ' and ' ~ column ~ ' is null)') -%}
+            {%- elif name == 'unique' -%}
+                {%- do checks.append('count(' ~ column ~ ') filter (where ' ~ scope ~ ') - count(distinct ' ~ column ~ ') filter (where ' ~ scope ~ ')') -%}
+            {%- elif name == 'accepted_values' -%}
+                {%- set values = [] -%}
+                {%- for value in kwargs['values'] -%}
+                    {%- do values.append("'" ~ (value | string | replace("'", "''")) ~ "'" if kwargs.get('quote', true) else value) -%}
+                {%- endfor -%}
+                {%- do checks.append('count(*) filter (where ' ~ scope ~ ' and ' ~ column ~ ' is not null and ' ~ column ~ ' not in (' ~ values | join(', ') ~ '))') -%}
+            {%- else -%}
+                {%- set parent_ids = test.depends_on.nodes | reject('equalto', target_id) | list or [target_id] -%}
+                {%- set parent_key = 'fused_parent_key_' ~ loop.index -%}
+                {%- do joins.append(
+                    'left join (select distinct ' ~ kwargs.field ~ ' as ' ~ parent_key
+                    ~ ' from ' ~ fused_test_relation(parent_ids[0]) ~ ') as fused_parent_' ~ loop.index
+                    ~ ' on fused_parent_' ~ loop.index ~ '.' ~ parent_key ~ ' = fused_model.' ~ column
+                ) -%}
+                {%- do checks.append('count(*) filter (where ' ~ scope ~ ' and fused_model.' ~ column ~ ' is not null and fused_parent_' ~ loop.index ~ '.' ~ parent_key ~ ' is null)') -%}
+            {%- endif -%}
+        {%- endfor -%}
+
+        {%- set fused_sql -%}
+            select
+            {%- for check in checks %}
+                {{ check }} as check_{{ loop.index }}{{ ',' if not loop.last }}
+            {%- endfor %}
+            from {{ fused_test_relation(target_id) }} as fused_model
+            {%- for join in joins %}
+            {{ join }}
+            {%- endfor %}
+        {%- endset -%}
+
+        {%- set started = modules.datetime.datetime.now() -%}
+        {%- set row = run_query(fused_sql).rows[0] -%}
+        {%- set elapsed = (modules.datetime.datetime.now() - started).total_seconds() -%}
+        {{ log((graph.nodes.get(target_id) or graph.sources.get(target_id)).name ~ ': ' ~ tests | length ~ ' tests in ' ~ '%.2f' | format(elapsed) ~ 's', info=True) }}
+
+        {%- for test in tests -%}
+            {%- set failures = row[loop.index0] -%}
+            {%- do totals.update({'tests': totals.tests + 1}) -%}
+            {%- if failures == 0 -%}
+                {{ log('    PASS ' ~ test.name, info=True) }}
+            {%- elif test.config.severity | lower == 'warn' -%}
+                {%- do totals.update({'warned': totals.warned + 1}) -%}
+                {{ log('    WARN ' ~ failures ~ ' ' ~ test.name, info=True) }}
+            {%- else -%}
+                {%- do totals.update({'failed': totals.failed + 1}) -%}
+                {{ log('    FAIL ' ~ failures ~ ' ' ~ test.name, info=True) }}
+            {%- endif -%}
+        {%- endfor -%}
+    {%- endfor -%}
+
+    {{ log('Fused ' ~ totals.tests ~ ' tests into ' ~ groups | length ~ ' queries: '
+           ~ (totals.tests - totals.failed - totals.warned) ~ ' passed, '
+           ~ totals.warned ~ ' warned, ' ~ totals.failed ~ ' failed', info=True) }}
+    {%- if totals.failed -%}
+        {{ exceptions.raise_compiler_error(totals.failed ~ ' fused schema test(s) failed') }}
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro fused_test_relation(node_id) %}
+    {#- Relation for a model or source node of the graph. -#}
+    {%- set node = graph.nodes.get(node_id) or graph.sources.get(node_id) -%}
+    {{ return(api.Relation.create(
+        database=node.database,
+        schema=node.schema,
+        identifier=node.identifier if node.resource_type == 'source' else node.alias
+    )) }}
+{% endmacro %}
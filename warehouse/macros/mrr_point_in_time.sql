@@ -0,0 +1,51 @@
+{% macro mrr_as_of(as_of_date, segments=none) %}
+    {#-
+    MRR per subscription on one date, from change-only MRR segments.
+
+    Args:
+        as_of_date: SQL date expression, e.g. "'2025-06-30'" or "current_date"
+        segments: Relation with [valid_from, valid_to) segments
+                  (default: fct_mrr_segments)
+
+    Usage:
+        select customer_id, sum(mrr) from ({{ mrr_as_of("'2025-06-30'") }}) group by 1
+    -#}
+    {%- set segments = segments or ref('fct_mrr_segments') -%}
+    select
+        cast({{ as_of_date }} as date) as as_of_date,
+        subscription_id,
+        customer_id,
+        plan_id,
+        status,
+        mrr
+    from {{ segments }}
+    where valid_from <= cast({{ as_of_date }} as date)
+        and valid_to > cast({{ as_of_date }} as date)
+{% endmacro %}
+
+
+{% macro mrr_month_ends(segments=none) %}
+    {#-
+    MRR per subscription on every month end of dim_date, from change-only
+    MRR segments (one interval join instead of a scan of daily rows).
+
+    Args:
+        segments: Relation with [valid_from, valid_to) segments
+                  (default: fct_mrr_segments)
+    -#}
+    {%- set segments = segments or ref('fct_mrr_segments') -%}
+    select
+        month_ends.month_end_date,
+        segments.subscription_id,
+        segments.customer_id,
+        segments.plan_id,
+        segments.status,
+        segments.mrr
+    from (
+        select distinct month_end_date
+        from {{ ref('dim_date') }}
+    ) month_ends
+    inner join {{ segments }} segments
+        on segments.valid_from <= month_ends.month_end_date
+        and segments.valid_to > month_ends.month_end_date
+{% endmacro %}
@@ -0,0 +1,101 @@
+{#-
+Change detection for fct_mrr_rollup_daily, built on the sidecar state of
+fct_mrr_daily (see changed_subscriptions.sql) instead of rescanning the fact:
+a subscription's rollup input is its fct_mrr_daily fingerprint plus the
+customer segment/country and plan billing frequencies it is grouped by.
+The rollup records these per subscription in its own state table; every day
+covered by a subscription whose input changed (old or new date range) is
+re-aggregated.
+
+    rollup_changed_days()         days to re-aggregate on this run
+    delete_vanished_rollup_days() post-hook: drop changed days that have no rows left
+    save_rollup_state()           post-hook: record the inputs the run aggregated
+-#}
+
+{% macro rollup_subscription_state() %}
+    {#- Current rollup input per subscription, shaped like a subscription state table. -#}
+    select
+        built.subscription_id,
+        md5(concat_ws('|',
+            built.source_fingerprint,
+            coalesce(customers.customer_segment, ''),
+            coalesce(customers.country, ''),
+            plan_catalog.catalog_hash
+        )) as source_fingerprint,
+        built.customer_id,
+        built.first_day,
+        built.last_day
+    from {{ subscription_state_relation(ref('fct_mrr_daily')) }} built
+    left join {{ ref('dim_customer') }} customers
+        on customers.customer_id = built.customer_id
+    cross join (
+        select
+            md5(string_agg(plan_id || ':' || coalesce(billing_frequency, ''), ',' order by plan_id)) as catalog_hash
+        from {{ ref('dim_plan') }}
+    ) plan_catalog
+{% endmacro %}
+
+
+{% macro rollup_changed_days() %}
+    {#-
+    Subquery of the days to re-aggregate: every day in the old or new date
+    range of a subscription that is new, removed or changed since the last
+    run. Without a recorded state every day of fct_mrr_daily and {{ this }}
+    is returned.
+    -#}
+    {%- set state = load_subscription_state() -%}
+    {%- if state is none %}
+    select date_day from {{ ref('fct_mrr_daily') }}
+    union
+    select date_day from {{ this }}
+    {%- else %}
+    select distinct unnest(generate_series(
+        changed_ranges.first_day::timestamp,
+        changed_ranges.last_day::timestamp,
+        interval 1 day
+    ))::date as date_day
+    from (
+        select current_state.first_day, current_state.last_day
+        from ({{ rollup_subscription_state() }}) current_state
+        left join {{ state }} loaded
+            on loaded.subscription_id = current_state.subscription_id
+            and loaded.source_fingerprint = current_state.source_fingerprint
+        where loaded.subscription_id is null
+
+        union all
+
+        select loaded.first_day, loaded.last_day
+        from {{ state }} loaded
+        left join ({{ rollup_subscription_state() }}) current_state
+            on current_state.subscription_id = loaded.subscription_id
+            and current_state.source_fingerprint = loaded.source_fingerprint
+        where current_state.subscription_id is null
+    ) changed_ranges
+    where changed_ranges.first_day is not null
+    {%- endif %}
+{% endmacro %}
+
+
+{% macro delete_vanished_rollup_days() %}
+    {#-
+    Post-hook: delete+insert replaces every re-aggregated day that still has
+    fct_mrr_daily rows; changed days without any rows left are deleted here.
+    Runs before save_rollup_state(), while the changed days still resolve.
+    -#}
+    {%- if is_incremental() %}
+    delete from {{ this }}
+    where date_day in ({{ rollup_changed_days() }})
+        and date_day not in (
+            select mrr_daily.date_day
+            from {{ ref('fct_mrr_daily') }} mrr_daily
+            where mrr_daily.date_day in ({{ rollup_changed_days() }})
+        )
+    {%- endif %}
+{% endmacro %}
+
+
+{% macro save_rollup_state() %}
+    {#- Post-hook: record the rollup input of every subscription. -#}
+    create or replace table {{ subscription_state_relation() }} as
+    {{ rollup_subscription_state() }}
+{% endmacro %}
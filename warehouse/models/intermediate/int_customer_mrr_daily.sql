@@ -1,6 +1,3 @@
-{{ config(materialized='view') }}
-
-
 {# 
 Customer-level MRR aggregation from subscription grain.
 Located in intermediate layer as it is a reusable building block
@@ -1,27 +1,40 @@
-{{ config(materialized='view') }}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='append'
+) }}
 
-{# Calculate date bounds in a single query to avoid multiple scans of the subscriptions table #}
+{#
+Persisted calendar spine. Bounds come from the date_spine_start /
+date_spine_end vars when set, otherwise from one min/max over
+stg_subscriptions evaluated when this model runs (never at compile time).
+Incremental runs only append days not stored yet, so the table grows when
+the data's date range grows and is otherwise left untouched. Use
+--full-refresh to shrink it after the date range contracts.
+#}
 
-{% set date_bounds_query %}
+{% set spine_start = var('date_spine_start', none) %}
+{% set spine_end = var('date_spine_end', none) %}
+
+with bounds as (
     select
-        coalesce(min(started_at)::date, current_date) as min_date,
-        coalesce(max(coalesce(current_period_end, canceled_at, started_at))::date, current_date) as max_date
+        {% if spine_start %}
+        '{{ spine_start }}'::date as start_date,
+        {% else %}
+        coalesce(min(started_at)::date, current_date) as start_date,
+        {% endif %}
+        {% if spine_end %}
+        '{{ spine_end }}'::date as end_date
+        {% else %}
+        coalesce(max(coalesce(current_period_end, canceled_at, started_at))::date, current_date) as end_date
+        {% endif %}
+    {% if not (spine_start and spine_end) %}
     from {{ ref('stg_subscriptions') }}
-{% endset %}
-
-{% set results = run_query(date_bounds_query) %}
-
-{% if execute %}
-    {% set start_date = results.columns[0][0] %}
-    {% set end_date = results.columns[1][0] %}
-{% else %}
-    {% set start_date = '2020-01-01' %}
-    {% set end_date = 'current_date' %}
-{% endif %}
-
-with date_range as (
+    {% endif %}
+),
+date_range as (
     select
-        unnest(generate_series('{{ start_date }}'::date, '{{ end_date }}'::date, interval '1 day'))::date as date_day
+        unnest(generate_series(start_date, end_date, interval '1 day'))::date as date_day
+    from bounds
 )
 
 select
@@ -30,4 +43,11 @@ select
     (date_trunc('month', date_day)::date + interval '1 month' - interval '1 day')::date as month_end,
     extract(year from date_day)::int as year,
     extract(month from date_day)::int as month
-from date_range
\ No newline at end of file
+from date_range
+{% if is_incremental() %}
+where not exists (
+    select 1
+    from {{ this }} as stored
+    where stored.date_day = date_range.date_day
+)
+{% endif %}
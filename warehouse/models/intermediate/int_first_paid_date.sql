@@ -1,5 +1,3 @@
-{{ config(materialized='view') }}
-
 with paid_invoices as (
     select
         customer_id,
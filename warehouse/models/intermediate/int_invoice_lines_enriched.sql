@@ -1,5 +1,3 @@
-{{ config(materialized='view') }}
-
 with invoice_lines as (
     select
         invoice_line_id,
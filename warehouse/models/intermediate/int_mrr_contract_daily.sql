@@ -1,77 +1,42 @@
-{{ config(materialized='view') }}
+{#
+Daily MRR per subscription, expanded from the interval-grain int_mrr_segments.
+Status, plan and the MRR policy are resolved once per segment there; this
+model only turns each [valid_from, valid_to) segment into its days.
+#}
 
-with status_daily as (
-    select
-        date_day,
-        subscription_id,
-        customer_id,
-        daily_status,
-        is_active_day
-    from {{ ref('int_subscription_status_daily') }}
+with spine as (
+    select date_day
+    from {{ ref('int_date_spine') }}
 ),
-plan_daily as (
+segments as (
     select
-        date_day,
-        subscription_id,
-        plan_id
-    from {{ ref('int_plan_daily') }}
-),
-plans as (
-    select
-        plan_id,
-        plan_name,
-        mrr_equivalent,
-        billing_frequency
-    from {{ ref('stg_plans') }}
-),
-joined as (
-    select
-        status_daily.date_day,
-        status_daily.subscription_id,
-        status_daily.customer_id,
-        plan_daily.plan_id,
-        status_daily.daily_status,
-        status_daily.is_active_day,
-        plans.plan_name,
-        plans.mrr_equivalent as plan_mrr,
-        plans.billing_frequency
-    from status_daily
-    inner join plan_daily
-        on status_daily.subscription_id = plan_daily.subscription_id
-        and status_daily.date_day = plan_daily.date_day
-    left join plans
-        on plan_daily.plan_id = plans.plan_id
-),
-mrr_calculated as (
-    select
-        date_day,
         subscription_id,
         customer_id,
         plan_id,
         plan_name,
         billing_frequency,
-        daily_status,
-        is_active_day,
-        plan_mrr,
-        case
-            when daily_status = 'active' then coalesce(plan_mrr, 0)
-            else 0
-        end as mrr
-    from joined
+        status,
+        is_active,
+        mrr,
+        valid_from,
+        valid_to
+    from {{ ref('int_mrr_segments') }}
 ),
 final as (
     select
-        date_day,
-        subscription_id,
-        customer_id,
-        plan_id,
-        plan_name,
-        billing_frequency,
-        daily_status,
-        is_active_day,
-        mrr
-    from mrr_calculated
-    where mrr >= 0
+        spine.date_day,
+        segments.subscription_id,
+        segments.customer_id,
+        segments.plan_id,
+        segments.plan_name,
+        segments.billing_frequency,
+        segments.status as daily_status,
+        segments.is_active as is_active_day,
+        segments.mrr
+    from segments
+    inner join spine
+        on spine.date_day >= segments.valid_from
+        and spine.date_day < segments.valid_to
 )
 
 select
@@ -84,4 +49,4 @@ select
     daily_status,
     is_active_day,
     mrr
-from final
\ No newline at end of file
+from final
@@ -1,5 +1,3 @@
-{{ config(materialized='view') }}
-
 with monthly as (
     select
         customer_id,
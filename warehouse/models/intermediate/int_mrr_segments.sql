@@ -0,0 +1,192 @@
+{#
+Interval-grain MRR: intersects status segments with plan segments per
+subscription into non-overlapping [valid_from, valid_to) segments, clipped
+to the subscription's coverage window and the date spine. Adjacent pieces
+with the same plan, status and MRR are merged, so one row stands for a whole
+run of identical days. Expanding every segment to its days reproduces the
+daily status x plan join (see int_mrr_contract_daily).
+#}
+
+-- spine_bounds: First and last day of the date spine
+with spine_bounds as (
+    select
+        min(date_day) as spine_start,
+        max(date_day) as spine_end
+    from {{ ref('int_date_spine') }}
+),
+
+-- coverage: Coverage window per subscription as [window_start, window_end)
+coverage as (
+    select
+        periods.subscription_id,
+        periods.customer_id,
+        greatest(periods.active_from_date, spine_bounds.spine_start) as window_start,
+        least(periods.active_to_date, spine_bounds.spine_end) + 1 as window_end
+    from {{ ref('int_subscription_periods') }} periods
+    cross join spine_bounds
+),
+
+-- status_segments: Status intervals from the event/snapshot timeline
+status_segments as (
+    select
+        subscription_id,
+        status,
+        status_start_date as segment_start,
+        status_end_date as segment_end
+    from {{ ref('int_subscription_status_segments') }}
+),
+
+-- first_status: Start of each subscription's status timeline
+first_status as (
+    select
+        subscription_id,
+        min(segment_start) as first_status_date
+    from status_segments
+    group by subscription_id
+),
+
+-- status_pieces: Status intervals plus an 'active' lead-in before the first one
+-- (days without a status segment default to 'active')
+status_pieces as (
+    select
+        subscription_id,
+        status,
+        segment_start,
+        segment_end
+    from status_segments
+
+    union all
+
+    select
+        coverage.subscription_id,
+        'active' as status,
+        coverage.window_start as segment_start,
+        first_status.first_status_date as segment_end
+    from coverage
+    left join first_status
+        on first_status.subscription_id = coverage.subscription_id
+    where first_status.first_status_date is null
+        or coverage.window_start < first_status.first_status_date
+),
+
+-- plan_pieces: Plan intervals (days without a plan have no MRR row)
+plan_pieces as (
+    select
+        subscription_id,
+        plan_id,
+        plan_start_date as segment_start,
+        plan_end_date as segment_end
+    from {{ ref('int_plan_events_timeline') }}
+    where plan_id is not null
+),
+
+-- pieces: Intersection of coverage x status x plan intervals (open ends = window end)
+pieces as (
+    select
+        coverage.subscription_id,
+        coverage.customer_id,
+        plan_pieces.plan_id,
+        status_pieces.status,
+        greatest(
+            coverage.window_start,
+            status_pieces.segment_start,
+            plan_pieces.segment_start
+        ) as valid_from,
+        least(
+            coverage.window_end,
+            coalesce(status_pieces.segment_end, coverage.window_end),
+            coalesce(plan_pieces.segment_end, coverage.window_end)
+        ) as valid_to
+    from coverage
+    inner join status_pieces
+        on status_pieces.subscription_id = coverage.subscription_id
+    inner join plan_pieces
+        on plan_pieces.subscription_id = coverage.subscription_id
+),
+
+-- priced: Apply the MRR policy (only active days carry the plan's MRR)
+priced as (
+    select
+        pieces.subscription_id,
+        pieces.customer_id,
+        pieces.plan_id,
+        plans.plan_name,
+        plans.billing_frequency,
+        pieces.status,
+        case
+            when pieces.status = 'active' then coalesce(plans.mrr_equivalent, 0)
+            else 0
+        end as mrr,
+        pieces.valid_from,
+        pieces.valid_to
+    from pieces
+    left join {{ ref('stg_plans') }} plans
+        on plans.plan_id = pieces.plan_id
+    where pieces.valid_from < pieces.valid_to
+),
+
+-- flagged: Mark pieces that do not simply continue the previous piece
+flagged as (
+    select
+        *,
+        case
+            when lag(valid_to) over (partition by subscription_id order by valid_from) = valid_from
+                and lag(plan_id) over (partition by subscription_id order by valid_from) = plan_id
+                and lag(status) over (partition by subscription_id order by valid_from) = status
+                and lag(mrr) over (partition by subscription_id order by valid_from) = mrr
+            then 0
+            else 1
+        end as is_new_segment
+    from priced
+    where mrr >= 0
+),
+
+-- numbered: Running segment number per subscription
+numbered as (
+    select
+        *,
+        sum(is_new_segment) over (
+            partition by subscription_id
+            order by valid_from
+            rows between unbounded preceding and current row
+        ) as segment_number
+    from flagged
+),
+
+-- merged: Collapse runs of identical pieces into one segment
+merged as (
+    select
+        subscription_id,
+        customer_id,
+        plan_id,
+        plan_name,
+        billing_frequency,
+        status,
+        mrr,
+        min(valid_from) as valid_from,
+        max(valid_to) as valid_to
+    from numbered
+    group by
+        subscription_id,
+        customer_id,
+        plan_id,
+        plan_name,
+        billing_frequency,
+        status,
+        mrr,
+        segment_number
+)
+
+select
+    subscription_id,
+    customer_id,
+    plan_id,
+    plan_name,
+    billing_frequency,
+    status,
+    status = 'active' as is_active,
+    mrr,
+    valid_from,
+    valid_to,
+    valid_to - valid_from as segment_days
+from merged
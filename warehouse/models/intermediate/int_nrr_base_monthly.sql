@@ -1,50 +1,62 @@
-{{ config(materialized='view') }}
+{#
+Month-start and month-end MRR per customer, evaluated on int_mrr_segments
+at the month boundaries only, instead of scanning every customer-day.
+As on the daily grain, a customer-month starts/ends on the first/last day
+in the month on which any of the customer's subscriptions has an MRR row.
+#}
 
-with customer_mrr_daily as (
+with segments as (
     select
-        date_day,
         customer_id,
-        customer_mrr
-    from {{ ref('int_customer_mrr_daily') }}
+        mrr,
+        valid_from,
+        valid_to
+    from {{ ref('int_mrr_segments') }}
 ),
-mrr_with_month as (
+segment_months as (
     select
-        date_day,
         customer_id,
-        customer_mrr,
-        date_trunc('month', date_day)::date as month
-    from customer_mrr_daily
+        valid_from,
+        valid_to,
+        unnest(generate_series(
+            date_trunc('month', valid_from)::date,
+            date_trunc('month', valid_to - 1)::date,
+            interval '1 month'
+        ))::date as month
+    from segments
 ),
 month_boundaries as (
     select
         customer_id,
         month,
-        min(date_day) as month_first_day,
-        max(date_day) as month_last_day
-    from mrr_with_month
+        min(greatest(valid_from, month)) as month_first_day,
+        max(least(valid_to - 1, (month + interval '1 month' - interval '1 day')::date)) as month_last_day
+    from segment_months
     group by customer_id, month
 ),
 mrr_start as (
     select
-        mrr_with_month.customer_id,
-        mrr_with_month.month,
-        mrr_with_month.customer_mrr as mrr_start
-    from mrr_with_month
-    inner join month_boundaries
-        on mrr_with_month.customer_id = month_boundaries.customer_id
-        and mrr_with_month.month = month_boundaries.month
-        and mrr_with_month.date_day = month_boundaries.month_first_day
+        month_boundaries.customer_id,
+        month_boundaries.month,
+        sum(segments.mrr) as mrr_start
+    from month_boundaries
+    inner join segments
+        on segments.customer_id = month_boundaries.customer_id
+        and segments.valid_from <= month_boundaries.month_first_day
+        and segments.valid_to > month_boundaries.month_first_day
+    group by month_boundaries.customer_id, month_boundaries.month
 ),
 mrr_end as (
     select
-        mrr_with_month.customer_id,
-        mrr_with_month.month,
-        mrr_with_month.customer_mrr as mrr_end
-    from mrr_with_month
-    inner join month_boundaries
-        on mrr_with_month.customer_id = month_boundaries.customer_id
-        and mrr_with_month.month = month_boundaries.month
-        and mrr_with_month.date_day = month_boundaries.month_last_day
+        month_boundaries.customer_id,
+        month_boundaries.month,
+        sum(segments.mrr) as mrr_end
+    from month_boundaries
+    inner join segments
+        on segments.customer_id = month_boundaries.customer_id
+        and segments.valid_from <= month_boundaries.month_last_day
+        and segments.valid_to > month_boundaries.month_last_day
+    group by month_boundaries.customer_id, month_boundaries.month
 ),
 combined as (
     select
@@ -63,4 +75,4 @@ select
     month,
     mrr_start,
     mrr_end
-from combined
\ No newline at end of file
+from combined
@@ -1,60 +1,17 @@
-{{ config(materialized='view') }}
-
--- plan_change_events: Extract plan upgrade/downgrade events from event log
-with plan_change_events as (
+-- plan_events: Plan assignments from the shared event stream (plan changes,
+-- creation events with a plan, and the subscriptions table as fallback seed)
+with plan_events as (
     select
         event_id,
         subscription_id,
         customer_id,
-        new_plan_id as plan_id,
-        coalesce(effective_date, date_trunc('day', occurred_at))::date as plan_change_date,
-        occurred_at,
-        event_type,
-        'plan_changed' as change_type
-    from {{ ref('stg_subscription_events') }}
-    where is_plan_change = true
-),
-
--- creation_events: Extract initial plan assignment from subscription creation events
-creation_events as (
-    select
-        event_id,
-        subscription_id,
-        customer_id,
-        new_plan_id as plan_id,
-        coalesce(effective_date, date_trunc('day', occurred_at))::date as plan_change_date,
-        occurred_at,
-        event_type,
-        'created' as change_type
-    from {{ ref('stg_subscription_events') }}
-    where is_activation_event = true
-        and new_plan_id is not null
-),
-
--- subscription_seed: Fallback baseline plan from subscriptions table if events are missing
-subscription_seed as (
-    select
-        null as event_id,
-        subscription_id,
-        customer_id,
         plan_id,
-        date_trunc('day', started_at)::date as plan_change_date,
-        started_at as occurred_at,
-        'seed' as event_type,
-        'created' as change_type
-    from {{ ref('stg_subscriptions') }}
-    where subscription_id is not null
-        and started_at is not null
-        and plan_id is not null
-),
-
--- all_plan_events: Combine all three sources into single timeline
-all_plan_events as (
-    select * from plan_change_events
-    union all
-    select * from creation_events
-    union all
-    select * from subscription_seed
+        event_date as plan_change_date,
+        occurred_at,
+        plan_priority,
+        case when plan_priority = 0 then 'plan_changed' else 'created' end as change_type
+    from {{ ref('int_subscription_event_stream') }}
+    where plan_priority is not null
 ),
 
 -- unique_plan_events: Deduplicate same-day plan changes, prioritizing plan_changed events over creation/seed
@@ -71,15 +28,12 @@ unique_plan_events as (
         select *,
             row_number() over (
                 partition by subscription_id, plan_change_date
-                order by 
-                    case when event_type = 'plan_changed' then 0
-                         when event_type = 'created' then 1
-                         else 2
-                    end,
+                order by
+                    plan_priority,
                     occurred_at,
                     event_id desc nulls last
             ) as rank_per_day
-        from all_plan_events
+        from plan_events
         where plan_change_date is not null
     ) ranked
     where rank_per_day = 1
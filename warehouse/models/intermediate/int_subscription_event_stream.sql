@@ -0,0 +1,58 @@
+{{ config(materialized='table') }}
+
+{#
+Normalized subscription event stream shared by the status and plan timelines.
+Reads the event log and the subscription snapshot once per build and stores
+one row per event plus one 'seed' row per subscription (its snapshot at the
+start date), sorted by (subscription_id, event_date) so per-subscription
+reads downstream stay cheap.
+
+status_priority / plan_priority decide which record wins when several fall
+on the same day (lower wins). plan_priority is null for rows that carry no
+plan assignment.
+#}
+
+with events as (
+    select
+        subscription_id,
+        customer_id,
+        event_id,
+        coalesce(effective_date, date_trunc('day', occurred_at))::date as event_date,
+        occurred_at,
+        event_type,
+        case
+            when event_type in ('canceled', 'churned') then 'canceled'
+            when event_type = 'paused' then 'paused'
+            when event_type = 'payment_failed' then 'delinquent'
+            when event_type in ('resumed', 'reactivated', 'created', 'payment_recovered') then 'active'
+            else 'active'
+        end as status,
+        new_plan_id as plan_id,
+        0 as status_priority,
+        case
+            when is_plan_change then 0
+            when is_activation_event and new_plan_id is not null then 1
+        end as plan_priority
+    from {{ ref('stg_subscription_events') }}
+),
+
+seeds as (
+    select
+        subscription_id,
+        customer_id,
+        null as event_id,
+        date_trunc('day', started_at)::date as event_date,
+        started_at as occurred_at,
+        'seed' as event_type,
+        status,
+        plan_id,
+        1 as status_priority,
+        case when plan_id is not null then 2 end as plan_priority
+    from {{ ref('stg_subscriptions') }}
+    where subscription_id is not null
+)
+
+select * from events
+union all
+select * from seeds
+order by subscription_id, event_date
@@ -0,0 +1,73 @@
+{#
+One hash per subscription over every input its daily rows depend on:
+the subscription snapshot, its full event history, its coverage window
+clipped to the date spine, and the plan price catalog.
+Incremental daily models store this hash and only recompute subscriptions
+whose hash changed since their last run.
+#}
+
+with spine_bounds as (
+    select
+        min(date_day) as spine_start,
+        max(date_day) as spine_end
+    from {{ ref('int_date_spine') }}
+),
+
+plan_catalog as (
+    select
+        md5(string_agg(plan_id || ':' || coalesce(mrr_equivalent::varchar, ''), ',' order by plan_id)) as catalog_hash
+    from {{ ref('stg_plans') }}
+),
+
+event_history as (
+    select
+        subscription_id,
+        string_agg(
+            concat_ws('|',
+                event_id,
+                coalesce(occurred_at::varchar, ''),
+                coalesce(event_date::varchar, ''),
+                coalesce(event_type, ''),
+                coalesce(plan_id, '')
+            ),
+            ',' order by event_id
+        ) as events
+    from {{ ref('int_subscription_event_stream') }}
+    where status_priority = 0
+    group by subscription_id
+),
+
+subscription_state as (
+    select
+        periods.subscription_id,
+        concat_ws('|',
+            periods.customer_id,
+            coalesce(subs.plan_id, ''),
+            coalesce(subs.status, ''),
+            coalesce(subs.started_at::varchar, ''),
+            coalesce(subs.canceled_at::varchar, ''),
+            coalesce(subs.paused_at::varchar, ''),
+            coalesce(subs.resumed_at::varchar, ''),
+            coalesce(subs.current_period_start::varchar, ''),
+            coalesce(subs.current_period_end::varchar, ''),
+            coalesce(subs.auto_renew::varchar, ''),
+            greatest(periods.active_from_date, spine_bounds.spine_start)::varchar,
+            least(periods.active_to_date, spine_bounds.spine_end)::varchar
+        ) as state
+    from {{ ref('int_subscription_periods') }} periods
+    inner join {{ ref('stg_subscriptions') }} subs
+        on subs.subscription_id = periods.subscription_id
+    cross join spine_bounds
+)
+
+select
+    subscription_state.subscription_id,
+    md5(concat_ws('#',
+        subscription_state.state,
+        coalesce(event_history.events, ''),
+        plan_catalog.catalog_hash
+    )) as source_fingerprint
+from subscription_state
+left join event_history
+    on event_history.subscription_id = subscription_state.subscription_id
+cross join plan_catalog
@@ -1,5 +1,3 @@
-{{ config(materialized='view') }}
-
 {# 
 For active subscriptions without a cancel date, we need a "current active until" date.
 Using current_period_end for active subscriptions gives us the most accurate picture.
@@ -1,7 +1,6 @@
-{{ config(materialized='view') }}
-
 {# 
-Combine two sources of subscription status data:
+Combine two sources of subscription status data (both normalized in
+int_subscription_event_stream):
 1. Event log - detailed history of status changes (priority 0 = higher priority)
 2. Subscription table - current state snapshot at start date (priority 1 = lower priority)
 The priority system ensures events win when deduplicating same-day records.
@@ -17,29 +16,20 @@ with event_source as (
     select
         event_id,
         subscription_id,
-        coalesce(effective_date, date_trunc('day', occurred_at))::date as event_date,
+        event_date,
         occurred_at,
-        case
-            when event_type in ('canceled', 'churned') then 'canceled'
-            when event_type = 'paused' then 'paused'
-            when event_type = 'payment_failed' then 'delinquent'
-            when event_type in ('resumed', 'reactivated', 'created', 'payment_recovered') then 'active'
-            else 'active'
-        end as status,
-        0 as source_priority
-    from {{ ref('stg_subscription_events') }}
-
-    union all
+        status,
+        status_priority as source_priority
+    from {{ ref('int_subscription_event_stream') }}
+),
 
+-- current_status: Snapshot status from the subscription table (seed rows)
+current_status as (
     select
-        null as event_id,
         subscription_id,
-        date_trunc('day', started_at)::date as event_date,
-        started_at as occurred_at,
-        status,
-        1 as source_priority
-    from {{ ref('stg_subscriptions') }}
-    where subscription_id is not null and started_at is not null
+        status
+    from {{ ref('int_subscription_event_stream') }}
+    where status_priority = 1
 ),
 
 
@@ -87,6 +77,6 @@ select
     status_end_date,
     status_event_id
 from status_intervals
-left join {{ ref('stg_subscriptions') }} sub
+left join current_status sub
     on sub.subscription_id = status_intervals.subscription_id
 where status_intervals.status_end_date is null or status_start_date < status_end_date
@@ -1,4 +1,23 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='subscription_id',
+    on_schema_change='sync_all_columns',
+    post_hook=[
+        "{{ delete_stale_subscriptions(ref('int_mrr_contract_daily')) }}",
+        "{{ save_subscription_state() }}"
+    ]
+) }}
+
+{#
+Incremental: recompute only subscriptions whose source fingerprint changed
+since the last run (see int_subscription_fingerprints) and replace all of
+their days; subscriptions that left the source or no longer produce any
+rows are deleted. The fingerprints the rows were built from are kept in the
+sidecar state table fct_mrr_daily__subscription_state
+(see macros/changed_subscriptions.sql).
+Run with --full-refresh after changing the model logic.
+#}
 
 with source as (
     select
@@ -9,6 +28,9 @@ with source as (
         daily_status,
         mrr
     from {{ ref('int_mrr_contract_daily') }}
+    {% if is_incremental() %}
+    where subscription_id in ({{ changed_subscriptions() }})
+    {% endif %}
 ),
 
 final as (
@@ -0,0 +1,34 @@
+{{ config(materialized='table') }}
+
+{#
+Change-only MRR fact: one row per subscription per run of identical
+(plan, status, MRR) days, valid on [valid_from, valid_to). Point-in-time
+questions use an interval predicate instead of scanning daily rows, see
+the mrr_as_of() and mrr_month_ends() macros.
+#}
+
+with source as (
+    select
+        subscription_id,
+        customer_id,
+        plan_id,
+        status,
+        mrr,
+        valid_from,
+        valid_to
+    from {{ ref('int_mrr_segments') }}
+),
+
+final as (
+    select
+        subscription_id,
+        customer_id,
+        plan_id,
+        status,
+        mrr,
+        valid_from,
+        valid_to
+    from source
+)
+
+select * from final
@@ -0,0 +1,88 @@
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='date_day',
+    on_schema_change='sync_all_columns',
+    post_hook=[
+        "{{ delete_vanished_rollup_days() }}",
+        "{{ save_rollup_state() }}"
+    ]
+) }}
+
+{#
+Pre-aggregated daily MRR for dashboards: MRR, active subscriptions and
+active customers per day, rolled up in one GROUPING SETS pass over
+fct_mrr_daily by plan, billing frequency, customer segment and country.
+rollup_level names the grouping set of a row; dimensions outside it are null.
+
+Incremental: the days to re-aggregate come from the per-subscription state
+of fct_mrr_daily, not from a scan of the fact (see macros/mrr_rollup_changes.sql).
+Only those days are aggregated again and replace the stored ones
+(delete+insert on date_day); a post-hook deletes the ones that vanished upstream.
+Run with --full-refresh after changing the model logic.
+#}
+
+with daily as (
+    select
+        mrr_daily.date_day,
+        mrr_daily.subscription_id,
+        mrr_daily.customer_id,
+        mrr_daily.plan_id,
+        mrr_daily.mrr,
+        plans.billing_frequency,
+        customers.customer_segment,
+        customers.country
+    from {{ ref('fct_mrr_daily') }} mrr_daily
+    left join {{ ref('dim_plan') }} plans
+        on plans.plan_id = mrr_daily.plan_id
+    left join {{ ref('dim_customer') }} customers
+        on customers.customer_id = mrr_daily.customer_id
+    {% if is_incremental() %}
+    where mrr_daily.date_day in ({{ rollup_changed_days() }})
+    {% endif %}
+),
+
+rollup as (
+    select
+        date_day,
+        grouping_id(plan_id, billing_frequency, customer_segment, country) as grouping_bits,
+        plan_id,
+        billing_frequency,
+        customer_segment,
+        country,
+        sum(mrr) as mrr,
+        count(*) filter (where mrr > 0) as active_subscriptions,
+        count(distinct customer_id) filter (where mrr > 0) as active_customers
+    from daily
+    group by grouping sets (
+        (date_day),
+        (date_day, plan_id, billing_frequency),
+        (date_day, billing_frequency),
+        (date_day, customer_segment),
+        (date_day, country),
+        (date_day, plan_id, billing_frequency, customer_segment, country)
+    )
+),
+
+final as (
+    select
+        date_day,
+        case grouping_bits
+            when 15 then 'total'
+            when 3 then 'plan'
+            when 11 then 'billing_frequency'
+            when 13 then 'customer_segment'
+            when 14 then 'country'
+            when 0 then 'plan_segment_country'
+        end as rollup_level,
+        plan_id,
+        billing_frequency,
+        customer_segment,
+        country,
+        mrr,
+        active_subscriptions,
+        active_customers
+    from rollup
+)
+
+select * from final
@@ -0,0 +1,46 @@
+{{ config(materialized='table') }}
+
+{#
+Month-end MRR rollup: the fct_mrr_rollup_daily rows of each month's last day.
+For a month that is not over yet, the last loaded day stands in for the month
+end (is_month_complete = false). A small table read straight off the daily
+rollup, so it is rebuilt in full on every run.
+#}
+
+with rollup_daily as (
+    select * from {{ ref('fct_mrr_rollup_daily') }}
+),
+
+month_as_of as (
+    select
+        dates.month_start_date,
+        dates.month_end_date,
+        max(rollup_daily.date_day) as as_of_date
+    from rollup_daily
+    inner join {{ ref('dim_date') }} dates
+        on dates.date_day = rollup_daily.date_day
+    group by
+        dates.month_start_date,
+        dates.month_end_date
+),
+
+final as (
+    select
+        month_as_of.month_start_date,
+        month_as_of.month_end_date,
+        month_as_of.as_of_date,
+        month_as_of.as_of_date = month_as_of.month_end_date as is_month_complete,
+        rollup_daily.rollup_level,
+        rollup_daily.plan_id,
+        rollup_daily.billing_frequency,
+        rollup_daily.customer_segment,
+        rollup_daily.country,
+        rollup_daily.mrr,
+        rollup_daily.active_subscriptions,
+        rollup_daily.active_customers
+    from month_as_of
+    inner join rollup_daily
+        on rollup_daily.date_day = month_as_of.as_of_date
+)
+
+select * from final
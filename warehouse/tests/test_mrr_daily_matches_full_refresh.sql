@@ -0,0 +1,37 @@
+-- Test: Incremental fct_mrr_daily Matches a Full Refresh
+-- =============================================================================
+-- A full refresh of fct_mrr_daily selects int_mrr_contract_daily as is, so
+-- after any incremental run the two must hold exactly the same rows.
+--
+-- Catches rows left behind by an incremental run, e.g. a changed
+-- subscription that no longer produces any rows (cancellation moved before
+-- the start) or a subscription that left the source, as well as rows that
+-- were not rebuilt after a source change.
+-- Should return 0 rows.
+-- =============================================================================
+
+with incremental_rows as (
+    select date_day, subscription_id, customer_id, plan_id, daily_status, mrr
+    from {{ ref('fct_mrr_daily') }}
+),
+
+full_refresh_rows as (
+    select date_day, subscription_id, customer_id, plan_id, daily_status, mrr
+    from {{ ref('int_mrr_contract_daily') }}
+),
+
+only_incremental as (
+    select * from incremental_rows
+    except all
+    select * from full_refresh_rows
+),
+
+only_full_refresh as (
+    select * from full_refresh_rows
+    except all
+    select * from incremental_rows
+)
+
+select 'stale incremental row' as issue, * from only_incremental
+union all
+select 'missing incremental row' as issue, * from only_full_refresh
@@ -0,0 +1,108 @@
+-- Test: MRR Rollup Reconciles with Daily MRR
+-- =============================================================================
+-- fct_mrr_rollup_daily pre-aggregates fct_mrr_daily. Its 'total' rows must
+-- equal a direct aggregation of the daily rows, and every other rollup level
+-- must add up to the same MRR and active subscriptions per day (each
+-- subscription falls in exactly one group of a level).
+--
+-- Checks:
+-- 1. 'total' rows match fct_mrr_daily per day (MRR, subscriptions, customers)
+-- 2. Every rollup level sums to the day's total MRR and active subscriptions
+-- 3. Month-end rows equal the daily rollup on their as_of_date
+-- Should return 0 rows if the rollups reconcile.
+-- =============================================================================
+
+with daily_totals as (
+    select
+        date_day,
+        sum(mrr) as mrr,
+        count(*) filter (where mrr > 0) as active_subscriptions,
+        count(distinct customer_id) filter (where mrr > 0) as active_customers
+    from {{ ref('fct_mrr_daily') }}
+    group by date_day
+),
+
+rollup_totals as (
+    select
+        date_day,
+        mrr,
+        active_subscriptions,
+        active_customers
+    from {{ ref('fct_mrr_rollup_daily') }}
+    where rollup_level = 'total'
+),
+
+level_sums as (
+    select
+        date_day,
+        rollup_level,
+        sum(mrr) as mrr,
+        sum(active_subscriptions) as active_subscriptions
+    from {{ ref('fct_mrr_rollup_daily') }}
+    group by date_day, rollup_level
+),
+
+month_end as (
+    select
+        as_of_date as date_day,
+        rollup_level,
+        plan_id,
+        billing_frequency,
+        customer_segment,
+        country,
+        mrr,
+        active_subscriptions,
+        active_customers
+    from {{ ref('fct_mrr_rollup_month_end') }}
+)
+
+-- Check 1: total rows differ from (or are missing for) a day of fct_mrr_daily
+select
+    coalesce(daily_totals.date_day, rollup_totals.date_day) as date_day,
+    'total' as rollup_level,
+    'Total row does not match fct_mrr_daily' as failure_reason
+from daily_totals
+full outer join rollup_totals
+    on rollup_totals.date_day = daily_totals.date_day
+where daily_totals.date_day is null
+    or rollup_totals.date_day is null
+    or abs(daily_totals.mrr - rollup_totals.mrr) > 0.01
+    or daily_totals.active_subscriptions != rollup_totals.active_subscriptions
+    or daily_totals.active_customers != rollup_totals.active_customers
+
+union all
+
+-- Check 2: a rollup level does not add up to the day's total
+select
+    level_sums.date_day,
+    level_sums.rollup_level,
+    'Rollup level does not sum to the daily total' as failure_reason
+from level_sums
+inner join rollup_totals
+    on rollup_totals.date_day = level_sums.date_day
+where abs(level_sums.mrr - rollup_totals.mrr) > 0.01
+    or level_sums.active_subscriptions != rollup_totals.active_subscriptions
+
+union all
+
+-- Check 3: month-end rows that are not daily rollup rows of their as_of_date
+select
+    date_day,
+    rollup_level,
+    'Month-end row has no matching daily rollup row' as failure_reason
+from (
+    select * from month_end
+    except all
+    select
+        date_day,
+        rollup_level,
+        plan_id,
+        billing_frequency,
+        customer_segment,
+        country,
+        mrr,
+        active_subscriptions,
+        active_customers
+    from {{ ref('fct_mrr_rollup_daily') }}
+    where date_day in (select as_of_date from {{ ref('fct_mrr_rollup_month_end') }})
+) missing_daily
@@ -0,0 +1,57 @@
+-- Test: MRR Segments Match Daily MRR
+-- =============================================================================
+-- fct_mrr_segments stores the same MRR as fct_mrr_daily, one row per run of
+-- identical days. Point-in-time lookups through mrr_as_of() and
+-- mrr_month_ends() must therefore return exactly the daily rows.
+--
+-- Checks (on every month end, and on one mid-month date):
+-- 1. Each daily row has a segment with the same plan, status and MRR
+-- 2. Each segment lookup row has a matching daily row
+-- Should return 0 rows if segments and daily rows agree.
+-- =============================================================================
+
+with daily as (
+    select
+        date_day,
+        subscription_id,
+        plan_id,
+        daily_status as status,
+        mrr
+    from {{ ref('fct_mrr_daily') }}
+    where date_day in (select month_end_date from {{ ref('dim_date') }})
+        or date_day = '2025-06-15'
+),
+
+segments as (
+    select month_end_date as date_day, subscription_id, plan_id, status, mrr
+    from ({{ mrr_month_ends() }}) month_end_mrr
+
+    union all
+
+    select as_of_date as date_day, subscription_id, plan_id, status, mrr
+    from ({{ mrr_as_of("'2025-06-15'") }}) as_of_mrr
+)
+
+-- Check 1: daily rows without a matching segment
+select
+    date_day,
+    subscription_id,
+    'Daily row has no matching segment' as failure_reason
+from (
+    select * from daily
+    except all
+    select * from segments
+) missing_segments
+
+union all
+
+-- Check 2: segment lookups without a matching daily row
+select
+    date_day,
+    subscription_id,
+    'Segment lookup has no matching daily row' as failure_reason
+from (
+    select * from segments
+    except all
+    select * from daily
+) missing_daily
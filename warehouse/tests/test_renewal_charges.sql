@@ -0,0 +1,41 @@
+-- Test: Renewal Charges Follow the Terms
+-- =============================================================================
+-- Business Rule: a subscription is charged once per term. Its recurring_charge
+-- service periods (the initial term plus one per renewal) must not overlap,
+-- and no term may start on or after the subscription's cancel date.
+--
+-- Renewals are generated by the bulk engine (invoices.renewals in
+-- data_generation/config.yml); CI builds a bulk dataset to exercise them.
+-- Should return 0 rows.
+-- =============================================================================
+
+with recurring_charges as (
+    select
+        subscription_id,
+        invoice_line_id,
+        service_period_start,
+        service_period_end,
+        lead(service_period_start) over (
+            partition by subscription_id
+            order by service_period_start, invoice_line_id
+        ) as next_period_start
+    from {{ ref('fct_invoice_lines') }}
+    where line_type = 'recurring_charge'
+)
+
+select
+    charges.subscription_id,
+    charges.invoice_line_id,
+    charges.service_period_start,
+    charges.service_period_end,
+    charges.next_period_start,
+    subscriptions.cancel_date,
+    case
+        when charges.next_period_start < charges.service_period_end then 'overlapping terms'
+        else 'term starts after cancellation'
+    end as issue
+from recurring_charges charges
+inner join {{ ref('dim_subscription') }} subscriptions
+    on subscriptions.subscription_id = charges.subscription_id
+where charges.next_period_start < charges.service_period_end
+    or charges.service_period_start >= subscriptions.cancel_date
@@ -7,15 +7,17 @@
 -- 
 -- This is the baseline "happy path" test — if this fails, something is
 -- fundamentally broken in MRR calculation.
+-- Runs on every copy of S001 (golden + generate.py --edge-case-copies);
 -- Should return 0 rows if MRR is correct.
 -- =============================================================================
 
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S001'
-  and daily_status = 'active'
-  and abs(mrr - 30.0) > 0.01  -- Allow tiny floating-point tolerance
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S001') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.daily_status = 'active'
+  and abs(daily.mrr - 30.0) > 0.01  -- Allow tiny floating-point tolerance
@@ -4,15 +4,17 @@
 -- Expected: MRR = 25.00 (300/12) on all active days.
 -- 
 -- This test finds any day where S002 is active but MRR ≠ 25.
+-- Runs on every copy of S002 (golden + generate.py --edge-case-copies);
 -- Should return 0 rows if MRR normalization is correct.
 -- =============================================================================
 
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S002'
-  and daily_status = 'active'
-  and abs(mrr - 25.0) > 0.01  -- Allow tiny floating-point tolerance
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S002') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.daily_status = 'active'
+  and abs(daily.mrr - 25.0) > 0.01  -- Allow tiny floating-point tolerance
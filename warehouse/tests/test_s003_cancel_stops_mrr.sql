@@ -5,15 +5,18 @@
 -- Expected: MRR = 0 on and after 2025-01-20 (cancel effective date).
 -- 
 -- This test finds any day after cancel where MRR > 0.
+-- Runs on every copy of S003 (golden + generate.py --edge-case-copies);
+-- replica dates are shifted by copies.shift_days.
 -- Should return 0 rows if cancellation logic is correct.
 -- =============================================================================
 
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S003'
-  and date_day >= '2025-01-20'  -- Cancel date from edge_cases.py
-  and mrr > 0
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S003') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-01-20' + copies.shift_days  -- Cancel date from edge_cases.yml
+  and daily.mrr > 0
@@ -5,22 +5,26 @@
 --   - At least 1 proration_credit (amount ≤ 0)
 --   - At least 1 proration_charge (amount ≥ 0)
 -- 
--- This test returns a row if proration pairing is broken.
+-- This test returns a row per copy of S005 (golden + generate.py
+-- --edge-case-copies) whose proration pairing is broken.
 -- Should return 0 rows if proration handling is correct.
 -- =============================================================================
 
 with proration_summary as (
     select
+        copies.subscription_id,
         sum(case when line_type = 'proration_credit' then 1 else 0 end) as credit_count,
         sum(case when line_type = 'proration_charge' then 1 else 0 end) as charge_count,
         sum(case when line_type = 'proration_credit' and amount > 0 then 1 else 0 end) as bad_credit_sign,
         sum(case when line_type = 'proration_charge' and amount < 0 then 1 else 0 end) as bad_charge_sign
-    from {{ ref('fct_invoice_lines') }}
-    where subscription_id = 'S005'
+    from ({{ edge_case_copies('S005') }}) copies
+    left join {{ ref('fct_invoice_lines') }} lines
+        on lines.subscription_id = copies.subscription_id
+    group by copies.subscription_id
 )
 
 select
-    'S005' as subscription_id,
+    subscription_id,
     credit_count,
     charge_count,
     bad_credit_sign,
@@ -17,20 +17,23 @@
 -- 
 -- Note: The exact effective date depends on your billing policy.
 -- This test checks the principle: MRR shouldn't drop until effective date.
+-- Runs on every copy of S009 (golden + generate.py --edge-case-copies);
+-- replica dates are shifted by copies.shift_days.
 -- Should return 0 rows if downgrade timing is correct.
 -- =============================================================================
 
 -- Check: MRR should remain at higher plan until effective date
 -- (before 2025-01-31, MRR should be 60, not 30)
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr,
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr,
     'MRR should be 60 before downgrade effective date' as failure_reason
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S009'
-  and date_day >= '2025-01-01'
-  and date_day < '2025-01-31'  -- Before effective date (period end)
-  and daily_status = 'active'
-  and abs(mrr - 60.0) > 0.01   -- Should be Pro price, not Basic
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S009') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-01-01' + copies.shift_days
+  and daily.date_day < date '2025-01-31' + copies.shift_days  -- Before effective date (period end)
+  and daily.daily_status = 'active'
+  and abs(daily.mrr - 60.0) > 0.01   -- Should be Pro price, not Basic
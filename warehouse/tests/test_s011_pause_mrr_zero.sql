@@ -8,34 +8,38 @@
 -- This test checks two conditions:
 -- 1. MRR = 0 during pause window
 -- 2. MRR > 0 on active days outside pause
+-- Runs on every copy of S011 (golden + generate.py --edge-case-copies);
+-- replica dates are shifted by copies.shift_days.
 -- Should return 0 rows if pause logic is correct.
 -- =============================================================================
 
 -- Check 1: MRR must be 0 during pause period
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr,
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr,
     'MRR should be 0 during pause' as failure_reason
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S011'
-  and date_day >= '2025-01-15'  -- Pause start
-  and date_day < '2025-01-29'   -- Resume date (exclusive, resume happens on this day)
-  and mrr > 0
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S011') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-01-15' + copies.shift_days  -- Pause start
+  and daily.date_day < date '2025-01-29' + copies.shift_days   -- Resume date (exclusive, resume happens on this day)
+  and daily.mrr > 0
 
 union all
 
 -- Check 2: MRR should be > 0 on active days before pause
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr,
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr,
     'MRR should be > 0 on active days before pause' as failure_reason
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S011'
-  and date_day >= '2025-01-01'  -- Start date
-  and date_day < '2025-01-15'   -- Before pause
-  and daily_status = 'active'
-  and mrr <= 0
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S011') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-01-01' + copies.shift_days  -- Start date
+  and daily.date_day < date '2025-01-15' + copies.shift_days   -- Before pause
+  and daily.daily_status = 'active'
+  and daily.mrr <= 0
@@ -10,49 +10,54 @@
 -- - MRR = 0 during canceled window (2025-02-10 to 2025-02-28)
 -- - MRR > 0 after reactivation (2025-03-01 onward)
 -- 
+-- Runs on every copy of S013 (golden + generate.py --edge-case-copies);
+-- replica dates are shifted by copies.shift_days.
 -- Should return 0 rows if cancel/reactivate logic is correct.
 -- =============================================================================
 
 -- Check 1: MRR must be > 0 before cancel
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr,
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr,
     'MRR should be > 0 before cancel' as failure_reason
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S013'
-  and date_day >= '2025-01-01'
-  and date_day < '2025-02-10'  -- Before cancel
-  and daily_status = 'active'
-  and mrr <= 0
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S013') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-01-01' + copies.shift_days
+  and daily.date_day < date '2025-02-10' + copies.shift_days  -- Before cancel
+  and daily.daily_status = 'active'
+  and daily.mrr <= 0
 
 union all
 
 -- Check 2: MRR must be 0 during canceled window
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr,
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr,
     'MRR should be 0 during canceled window' as failure_reason
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S013'
-  and date_day >= '2025-02-10'  -- Cancel date
-  and date_day < '2025-03-01'   -- Before reactivation
-  and mrr > 0
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S013') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-02-10' + copies.shift_days  -- Cancel date
+  and daily.date_day < date '2025-03-01' + copies.shift_days   -- Before reactivation
+  and daily.mrr > 0
 
 union all
 
 -- Check 3: MRR must be > 0 after reactivation
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr,
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr,
     'MRR should be > 0 after reactivation' as failure_reason
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S013'
-  and date_day >= '2025-03-01'  -- Reactivation date
-  and daily_status = 'active'
-  and mrr <= 0
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S013') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-03-01' + copies.shift_days  -- Reactivation date
+  and daily.daily_status = 'active'
+  and daily.mrr <= 0
@@ -6,17 +6,20 @@
 --           daily_status should be 'delinquent' during this period.
 -- 
 -- This test finds days in the delinquent window where MRR > 0.
+-- Runs on every copy of S014 (golden + generate.py --edge-case-copies);
+-- replica dates are shifted by copies.shift_days.
 -- Should return 0 rows if delinquent handling is correct.
 -- =============================================================================
 
 select
-    date_day,
-    subscription_id,
-    daily_status,
-    mrr,
+    daily.date_day,
+    daily.subscription_id,
+    daily.daily_status,
+    daily.mrr,
     'MRR should be 0 during delinquent window' as failure_reason
-from {{ ref('fct_mrr_daily') }}
-where subscription_id = 'S014'
-  and date_day >= '2025-01-31'  -- Payment failed date
-  and date_day < '2025-02-10'   -- Payment recovered date (exclusive)
-  and mrr > 0
+from {{ ref('fct_mrr_daily') }} daily
+inner join ({{ edge_case_copies('S014') }}) copies
+    on copies.subscription_id = daily.subscription_id
+where daily.date_day >= date '2025-01-31' + copies.shift_days  -- Payment failed date
+  and daily.date_day < date '2025-02-10' + copies.shift_days   -- Payment recovered date (exclusive)
+  and daily.mrr > 0
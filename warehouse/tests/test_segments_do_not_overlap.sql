@@ -0,0 +1,60 @@
+-- Test: Interval Models Do Not Overlap
+-- =============================================================================
+-- Business Rule: a subscription has exactly one status, one plan and one MRR
+-- per day. The interval models must therefore hold non-overlapping intervals
+-- per subscription (end dates are exclusive; a null end is open-ended).
+--
+-- This took over from the (subscription_id, date_day) uniqueness tests of
+-- the removed daily expansions int_subscription_status_daily/int_plan_daily.
+-- Should return 0 rows.
+-- =============================================================================
+
+with intervals as (
+    select
+        'int_subscription_status_segments' as model_name,
+        subscription_id,
+        status_start_date as interval_start,
+        status_end_date as interval_end
+    from {{ ref('int_subscription_status_segments') }}
+
+    union all
+
+    select
+        'int_plan_events_timeline' as model_name,
+        subscription_id,
+        plan_start_date as interval_start,
+        plan_end_date as interval_end
+    from {{ ref('int_plan_events_timeline') }}
+
+    union all
+
+    select
+        'int_mrr_segments' as model_name,
+        subscription_id,
+        valid_from as interval_start,
+        valid_to as interval_end
+    from {{ ref('int_mrr_segments') }}
+),
+
+ordered as (
+    select
+        model_name,
+        subscription_id,
+        interval_start,
+        interval_end,
+        lead(interval_start) over (
+            partition by model_name, subscription_id
+            order by interval_start
+        ) as next_interval_start
+    from intervals
+)
+
+select
+    model_name,
+    subscription_id,
+    interval_start,
+    interval_end,
+    next_interval_start
+from ordered
+where next_interval_start is not null
+    and (interval_end is null or interval_end > next_interval_start)